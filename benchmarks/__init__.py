@@ -0,0 +1,7 @@
+"""
+Benchmarks and load-test harnesses (run from the repo root).
+
+Usage:
+    python -m benchmarks.load_test --concurrency 16 --requests-per-endpoint 500
+    python -m benchmarks.load_test --compare bench_results/baseline.json
+"""
@@ -0,0 +1,266 @@
+"""
+Shared helpers for benchmarks: fake DB connection, latency and allocation stats,
+result files, and the CLI runner every `python -m benchmarks.<name>` uses.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from src.main.services.database.conn_instance import MakeConnection
+from src.main.utils.deadline import DeadlineExceededError, budget
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PAYLOAD = REPO_ROOT / "payload.json"
+DEFAULT_RESULTS_DIR = REPO_ROOT / "bench_results"
+
+
+# -------------------------
+# Fake DB connection
+# -------------------------
+class FakeMakeConnection(MakeConnection):
+    """
+    MakeConnection stand-in that sleeps instead of talking to a database.
+    `latency_ms` is applied to every query/non_query call; `rows` is returned by query().
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        rows: Optional[list[dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(dsn="fake", user="fake", password="fake", **kwargs)
+        self.latency_s = latency_ms / 1000.0
+        self.rows = rows or []
+        self.calls = 0
+
+    def _wait(self) -> None:
+        # Behaves like a driver call timeout: sleep at most the remaining request budget
+        self.calls += 1
+        timeout = budget(None, "fake db call")
+        if timeout is not None and timeout < self.latency_s:
+            time.sleep(timeout)
+            raise DeadlineExceededError("fake DB call exceeded the request deadline")
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+
+    def query(self, sql: str, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
+        self._wait()
+        return list(self.rows)
+
+    def iter_query(
+        self, sql: str, params: Optional[Iterable[Any]] = None, batch_size: int = 10000
+    ) -> Iterator[dict[str, Any]]:
+        self._wait()
+        yield from self.rows
+
+    def non_query(self, sql: str, params: Optional[Iterable[Any]] = None) -> int:
+        self._wait()
+        return 1
+
+
+def install_fake_db(latency_ms: float = 0.0, **kwargs: Any) -> FakeMakeConnection:
+    """
+    Swap the shared db_api connection for a FakeMakeConnection and return it.
+    """
+    from src.main.services.database import db_api
+
+    fake = FakeMakeConnection(latency_ms=latency_ms, **kwargs)
+    db_api.conn = fake
+    return fake
+
+
+# -------------------------
+# Stats
+# -------------------------
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile over an already sorted list (0.0 for empty input).
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_s: list[float], wall_s: float) -> dict[str, float]:
+    """
+    Reduce raw per-request latencies (seconds) into RPS and p50/p95/p99 in ms.
+    """
+    values = sorted(latencies_s)
+    count = len(values)
+    return {
+        "count": count,
+        "rps": round(count / wall_s, 2) if wall_s > 0 else 0.0,
+        "mean_ms": round(sum(values) / count * 1000.0, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000.0, 3),
+        "p95_ms": round(percentile(values, 95) * 1000.0, 3),
+        "p99_ms": round(percentile(values, 99) * 1000.0, 3),
+        "max_ms": round(values[-1] * 1000.0, 3) if count else 0.0,
+    }
+
+
+class AllocationSampler:
+    """
+    Per-request allocation stats from tracemalloc, for a short sequential pass run
+    apart from the timed one (tracing slows everything down):
+
+    - alloc_kib_per_req: peak traced memory above the level at request start.
+    - alloc_blocks_per_req: memory blocks allocated during the request and still
+      live at its end. tracemalloc only tracks live blocks, so this is not a count
+      of every malloc: objects created and freed inside the request are missed.
+
+        with AllocationSampler() as sampler:
+            for spec in specs:
+                with sampler.request():
+                    send(spec)
+        stats.update(sampler.result())
+    """
+
+    # Snapshot bookkeeping and imports are not the request's doing
+    _FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.peak_bytes = 0
+        self.blocks = 0
+
+    def __enter__(self) -> "AllocationSampler":
+        tracemalloc.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        tracemalloc.stop()
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        before_snapshot = tracemalloc.take_snapshot().filter_traces(self._FILTERS)
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        yield
+        _, peak = tracemalloc.get_traced_memory()
+        after_snapshot = tracemalloc.take_snapshot().filter_traces(self._FILTERS)
+        diff = after_snapshot.compare_to(before_snapshot, "lineno")
+        self.samples += 1
+        self.peak_bytes += max(0, peak - before)
+        self.blocks += sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+
+    def result(self) -> dict[str, float]:
+        if not self.samples:
+            return {"alloc_kib_per_req": 0.0, "alloc_blocks_per_req": 0.0}
+        return {
+            "alloc_kib_per_req": round(self.peak_bytes / self.samples / 1024.0, 3),
+            "alloc_blocks_per_req": round(self.blocks / self.samples, 1),
+        }
+
+
+# -------------------------
+# Result files
+# -------------------------
+def environment_info() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(results: dict[str, Any], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    logger.info("Benchmark results written to %s", path)
+    return path
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+# Metric name -> True if higher is better
+COMPARED_METRICS = {
+    "rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "cpu_ms_per_req": False,
+    "alloc_kib_per_req": False,
+    "alloc_blocks_per_req": False,
+}
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = 0.10,
+) -> list[str]:
+    """
+    Compare `current` against `baseline` run by run and endpoint by endpoint.
+    Return human-readable regression lines; a metric regresses when it moves the
+    wrong way by more than `threshold` (fraction of the baseline value).
+    """
+    regressions: list[str] = []
+    for run_name, endpoints in current.get("runs", {}).items():
+        base_endpoints = baseline.get("runs", {}).get(run_name, {})
+        for endpoint, metrics in endpoints.items():
+            base_metrics = base_endpoints.get(endpoint)
+            if not base_metrics:
+                continue
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                old, new = base_metrics.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+                    regressions.append(
+                        f"[{run_name}] {endpoint} {metric}: {old} -> {new} ({change:+.1%})"
+                    )
+    return regressions
+
+
+# -------------------------
+# CLI runner
+# -------------------------
+def run_benchmark(
+    name: str,
+    description: Optional[str],
+    add_arguments: Callable[[argparse.ArgumentParser], None],
+    scenario: Callable[[argparse.Namespace], dict[str, Any]],
+    argv: Optional[list[str]] = None,
+    show: Optional[str] = None,
+    check: Optional[Callable[[argparse.Namespace, dict[str, Any]], int]] = None,
+) -> int:
+    """
+    Parse the benchmark's own options plus `--output` (bench_results/<name>.json),
+    run `scenario(args)`, write its sections under an "env" header and print
+    them (only section `show`, if given). `check` can turn the results into a
+    non-zero exit code, e.g. on regressions against a baseline.
+    """
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS_DIR / f"{name}.json")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    results = {"env": environment_info(), **scenario(args)}
+    write_results(results, args.output)
+    shown = results[show] if show else {k: v for k, v in results.items() if k != "env"}
+    print(json.dumps(shown, indent=2, default=str))
+    return check(args, results) if check is not None else 0
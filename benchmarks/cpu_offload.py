@@ -0,0 +1,112 @@
+"""
+/healthy latency while CPU-heavy requests run: inline vs process-pool offload.
+
+A throwaway route (/bench/cpu) burns CPU through a @cpu_bound function while
+background threads keep it busy; /healthy is probed sequentially meanwhile.
+Inline, the burner holds the GIL and /healthy latency climbs; offloaded, it
+should stay close to the idle baseline.
+
+Usage:
+    python -m benchmarks.cpu_offload --load-threads 4 --workers 2 --probes 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from benchmarks.common import install_fake_db, run_benchmark, summarize
+from src.main.services.executor import cpu_bound, cpu_pool
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {"header_1": "bench", "header_2": "bench"}
+
+
+@cpu_bound
+def burn(iterations: int) -> int:
+    """
+    Pure-Python CPU burner (holds the GIL for its whole run when inline).
+    """
+    acc = 0
+    for i in range(iterations):
+        acc = (acc + i * i) % 1_000_003
+    return acc
+
+
+def _probe_healthy(client: Any, probes: int) -> dict[str, float]:
+    latencies = []
+    wall0 = time.perf_counter()
+    for _ in range(probes):
+        t0 = time.perf_counter()
+        client.get("/healthy", headers=HEADERS)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - wall0)
+
+
+def _scenario(client: Any, load_threads: int, probes: int) -> dict[str, Any]:
+    stop = threading.Event()
+    done = [0]
+
+    def load() -> None:
+        while not stop.is_set():
+            client.get("/bench/cpu", headers=HEADERS)
+            done[0] += 1
+
+    threads = [threading.Thread(target=load, daemon=True) for _ in range(load_threads)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)  # let the load ramp up
+    try:
+        stats = _probe_healthy(client, probes)
+        stats["cpu_requests_completed"] = done[0]
+        stats["pool"] = cpu_pool.metrics()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    return stats
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--load-threads", type=int, default=4, help="concurrent CPU-heavy request loops")
+    parser.add_argument("--iterations", type=int, default=300_000, help="burn() loop size per CPU request")
+    parser.add_argument("--workers", type=int, default=2, help="process pool size")
+    parser.add_argument("--probes", type=int, default=200, help="/healthy requests per scenario")
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    from fastapi.testclient import TestClient
+
+    install_fake_db()
+    from src.main.main import app
+
+    def cpu_endpoint() -> dict[str, int]:
+        return {"result": burn(args.iterations)}
+
+    app.add_api_route("/bench/cpu", cpu_endpoint, methods=["GET"])
+
+    results: dict[str, Any] = {"config": vars(args) | {"output": str(args.output)}, "scenarios": {}}
+    with TestClient(app) as client:
+        results["scenarios"]["idle"] = _probe_healthy(client, args.probes)
+        results["scenarios"]["inline"] = _scenario(client, args.load_threads, args.probes)
+
+        cpu_pool.max_workers = args.workers
+        cpu_pool.start()
+        try:
+            results["scenarios"]["offload"] = _scenario(client, args.load_threads, args.probes)
+        finally:
+            cpu_pool.shutdown()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("cpu_offload", __doc__, add_arguments, scenario, argv, show="scenarios")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
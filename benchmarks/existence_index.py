@@ -0,0 +1,104 @@
+"""
+finddb2 with and without the Bloom existence index.
+
+1. Build: stream `--keys` keys through DB_Interface.iter_keys into a fresh
+   snapshot, then re-attach to it the way a restarted worker does.
+2. Lookups: `--lookups` finddb2 calls against a fake DB with injected latency,
+   `--miss-ratio` of them for keys that don't exist. Without the index every call
+   is a round trip; with it, definite misses return False without one.
+
+Usage:
+    python -m benchmarks.existence_index --keys 100000 --miss-ratio 0.9 --db-latency-ms 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.common import FakeMakeConnection, run_benchmark, summarize
+from src.main.services.cache import BloomFilter
+from src.main.services.database.db_interface import DB_Interface
+
+
+class _ExistsConnection(FakeMakeConnection):
+    """
+    query() finds a row only for keys in `existing`; iter_query() streams all of them.
+    """
+
+    def __init__(self, existing: set[str], **kwargs: Any) -> None:
+        super().__init__(rows=[{"COLUMNNAME": k} for k in existing], **kwargs)
+        self.existing = existing
+
+    def query(self, sql: str, params: Optional[Any] = None) -> list[dict[str, Any]]:
+        self._wait()
+        (value,) = params
+        return [{"1": 1}] if value in self.existing else []
+
+
+def _lookups(db: DB_Interface, values: list[str]) -> dict[str, Any]:
+    db.conn.calls = 0
+    latencies = []
+    t0 = time.perf_counter()
+    for v in values:
+        s = time.perf_counter()
+        db.finddb2(v)
+        latencies.append(time.perf_counter() - s)
+    report = summarize(latencies, time.perf_counter() - t0)
+    report["db_calls"] = db.conn.calls
+    return report
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--keys", type=int, default=100_000, help="distinct keys in the table")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--miss-ratio", type=float, default=0.9, help="share of lookups for absent keys")
+    parser.add_argument("--fp-rate", type=float, default=0.01)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    existing = {f"key-{i}" for i in range(args.keys)}
+    rng = random.Random(0)
+    values = [
+        f"absent-{i}" if rng.random() < args.miss_ratio else f"key-{rng.randrange(args.keys)}"
+        for i in range(args.lookups)
+    ]
+
+    db = DB_Interface(dsn="fake", user="fake", password="fake")
+    db.conn = _ExistsConnection(existing, latency_ms=args.db_latency_ms)
+    report: dict[str, Any] = {"without_index": _lookups(db, values)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "finddb2.bloom"
+        index = BloomFilter(path, capacity=args.keys, fp_rate=args.fp_rate)
+        t0 = time.perf_counter()
+        index.rebuild(db.iter_keys())
+        build_s = time.perf_counter() - t0
+        index.close()
+
+        t0 = time.perf_counter()
+        db.existence_index = BloomFilter(path, capacity=args.keys, fp_rate=args.fp_rate)  # "restart"
+        attach_s = time.perf_counter() - t0
+
+        report["build_ms"] = round(build_s * 1000, 2)
+        report["reattach_ms"] = round(attach_s * 1000, 3)
+        report["with_index"] = _lookups(db, values)
+        report["index"] = db.existence_index.metrics()
+        db.existence_index.close()
+
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    return {"params": params, "results": report}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("existence_index", __doc__, add_arguments, scenario, argv, show="results")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
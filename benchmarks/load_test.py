@@ -0,0 +1,236 @@
+"""
+In-process load test: replay payload.json (and optional JSONL request files)
+against the ASGI app with the sync and async clients. No network involved.
+
+Reports per endpoint: RPS, p50/p95/p99 latency, CPU ms per request and
+allocated KiB and live blocks per request. Results go to a JSON file; `--compare` flags
+regressions against a stored baseline (non-zero exit code on regression).
+
+JSONL lines are either a full request spec
+    {"method": "POST", "path": "/router1/posturl", "headers": {...}, "body": {...}}
+or a bare body, which is replayed against /router1/posturl.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.common import (
+    DEFAULT_PAYLOAD,
+    AllocationSampler,
+    compare_results,
+    install_fake_db,
+    load_results,
+    run_benchmark,
+    summarize,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {"header_1": "bench", "header_2": "bench"}
+
+
+@dataclass
+class RequestSpec:
+    method: str
+    path: str
+    body: Optional[Any] = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+# -------------------------
+# Request corpus
+# -------------------------
+def load_specs(payload_path: Path, jsonl_paths: list[Path]) -> list[RequestSpec]:
+    """
+    Build the request corpus: /healthy plus one POST per payload/JSONL entry.
+    """
+    specs = [RequestSpec("GET", "/healthy")]
+    if payload_path and payload_path.exists():
+        body = json.loads(payload_path.read_text(encoding="utf-8"))
+        specs.append(RequestSpec("POST", "/router1/posturl", body=body))
+    for path in jsonl_paths:
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if isinstance(item, dict) and "path" in item:
+                    specs.append(
+                        RequestSpec(
+                            method=str(item.get("method", "POST")).upper(),
+                            path=item["path"],
+                            body=item.get("body"),
+                            headers=item.get("headers", {}),
+                        )
+                    )
+                else:
+                    specs.append(RequestSpec("POST", "/router1/posturl", body=item))
+    return specs
+
+
+def group_by_endpoint(specs: list[RequestSpec]) -> dict[str, list[RequestSpec]]:
+    grouped: dict[str, list[RequestSpec]] = {}
+    for spec in specs:
+        grouped.setdefault(spec.endpoint, []).append(spec)
+    return grouped
+
+
+# -------------------------
+# Runners
+# -------------------------
+def _send_sync(client: Any, spec: RequestSpec) -> int:
+    headers = {**DEFAULT_HEADERS, **spec.headers}
+    resp = client.request(spec.method, spec.path, json=spec.body, headers=headers)
+    return resp.status_code
+
+
+async def _send_async(client: Any, spec: RequestSpec) -> int:
+    headers = {**DEFAULT_HEADERS, **spec.headers}
+    resp = await client.request(spec.method, spec.path, json=spec.body, headers=headers)
+    return resp.status_code
+
+
+def _allocations_per_request(send: Any, specs: list[RequestSpec], samples: int) -> dict[str, float]:
+    """
+    Allocation stats over a short sequential pass (see AllocationSampler).
+    """
+    with AllocationSampler() as sampler:
+        for spec in islice(cycle(specs), max(samples, 0)):
+            with sampler.request():
+                send(spec)
+    return sampler.result()
+
+
+def run_sync(app: Any, grouped: dict[str, list[RequestSpec]], total: int, concurrency: int, alloc_samples: int) -> dict[str, Any]:
+    from fastapi.testclient import TestClient
+
+    report: dict[str, Any] = {}
+    with TestClient(app) as client, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for endpoint, specs in grouped.items():
+            _send_sync(client, specs[0])  # warm-up
+
+            def timed(spec: RequestSpec) -> tuple[float, int]:
+                t0 = time.perf_counter()
+                code = _send_sync(client, spec)
+                return time.perf_counter() - t0, code
+
+            cpu0, wall0 = time.process_time(), time.perf_counter()
+            outcomes = list(pool.map(timed, islice(cycle(specs), total)))
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+
+            stats = summarize([lat for lat, _ in outcomes], wall)
+            stats["errors"] = sum(1 for _, code in outcomes if code >= 400)
+            stats["cpu_ms_per_req"] = round(cpu / total * 1000.0, 3)
+            stats.update(_allocations_per_request(lambda s: _send_sync(client, s), specs, alloc_samples))
+            report[endpoint] = stats
+    return report
+
+
+async def _run_async(app: Any, grouped: dict[str, list[RequestSpec]], total: int, concurrency: int, alloc_samples: int) -> dict[str, Any]:
+    import httpx
+
+    report: dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint, specs in grouped.items():
+            await _send_async(client, specs[0])  # warm-up
+            sem = asyncio.Semaphore(concurrency)
+
+            async def timed(spec: RequestSpec) -> tuple[float, int]:
+                async with sem:
+                    t0 = time.perf_counter()
+                    code = await _send_async(client, spec)
+                    return time.perf_counter() - t0, code
+
+            cpu0, wall0 = time.process_time(), time.perf_counter()
+            outcomes = await asyncio.gather(*(timed(s) for s in islice(cycle(specs), total)))
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+
+            stats = summarize([lat for lat, _ in outcomes], wall)
+            stats["errors"] = sum(1 for _, code in outcomes if code >= 400)
+            stats["cpu_ms_per_req"] = round(cpu / total * 1000.0, 3)
+
+            # Sequential tracemalloc pass (same loop, one request at a time)
+            with AllocationSampler() as sampler:
+                for spec in islice(cycle(specs), max(alloc_samples, 0)):
+                    with sampler.request():
+                        await _send_async(client, spec)
+            stats.update(sampler.result())
+            report[endpoint] = stats
+    return report
+
+
+def run_async(app: Any, grouped: dict[str, list[RequestSpec]], total: int, concurrency: int, alloc_samples: int) -> dict[str, Any]:
+    return asyncio.run(_run_async(app, grouped, total, concurrency, alloc_samples))
+
+
+# -------------------------
+# CLI
+# -------------------------
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--payload", type=Path, default=DEFAULT_PAYLOAD, help="JSON body for /router1/posturl")
+    parser.add_argument("--requests", type=Path, action="append", default=[], help="JSONL request file (repeatable)")
+    parser.add_argument("--clients", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests-per-endpoint", type=int, default=300)
+    parser.add_argument("--alloc-samples", type=int, default=50, help="requests traced for allocation stats (0 = off)")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="latency injected per fake DB call")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression (0.10 = 10%%)")
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    install_fake_db(latency_ms=args.db_latency_ms)
+    from src.main.main import app  # import after the fake DB is in place
+
+    grouped = group_by_endpoint(load_specs(args.payload, args.requests))
+    results: dict[str, Any] = {
+        "config": {
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests_per_endpoint,
+            "db_latency_ms": args.db_latency_ms,
+        },
+        "runs": {},
+    }
+    if args.clients in ("sync", "both"):
+        results["runs"]["sync"] = run_sync(app, grouped, args.requests_per_endpoint, args.concurrency, args.alloc_samples)
+    if args.clients in ("async", "both"):
+        results["runs"]["async"] = run_async(app, grouped, args.requests_per_endpoint, args.concurrency, args.alloc_samples)
+    return results
+
+
+def check_baseline(args: argparse.Namespace, results: dict[str, Any]) -> int:
+    if not args.compare:
+        return 0
+    regressions = compare_results(results, load_results(args.compare), args.threshold)
+    if regressions:
+        print("Regressions vs baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions vs baseline.")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("load_test", __doc__, add_arguments, scenario, argv, show="runs", check=check_baseline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+MessagePack vs JSON for Router1ResponseModel envelopes of increasing size.
+
+Encode measures what handle_resp does per response (JSON: jsonable_encoder +
+json.dumps as in JSONResponse; msgpack: model_dump(mode="json") + packb).
+Decode measures what a caller does with the bytes it receives.
+
+Usage:
+    python -m benchmarks.msgpack_codec --rows 10 100 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Optional
+
+import msgpack
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import run_benchmark
+from src.main.schemas.router1.responsemodels import Router1ResponseModel
+
+
+def make_model(rows: int) -> Router1ResponseModel:
+    data = [
+        {
+            "id": i,
+            "columnname": f"key-{i % 97}",
+            "column2name": "2024-01-01 00:00:00",
+            "amount": i * 1.25,
+            "active": i % 2 == 0,
+            "tags": ["a", "b", "c"],
+        }
+        for i in range(rows)
+    ]
+    return Router1ResponseModel(data=data)
+
+
+def _json_encode(model: Router1ResponseModel) -> bytes:
+    # Mirrors starlette JSONResponse.render
+    return json.dumps(
+        jsonable_encoder(model), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _msgpack_encode(model: Router1ResponseModel) -> bytes:
+    return msgpack.packb(model.model_dump(mode="json"), use_bin_type=True)
+
+
+def _time_us(fn: Callable[[], Any], min_seconds: float) -> float:
+    fn()  # warm-up
+    count, t0 = 0, time.perf_counter()
+    while True:
+        fn()
+        count += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_seconds:
+            return round(elapsed / count * 1e6, 2)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="time spent per measurement")
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    report: dict[str, Any] = {}
+    for rows in args.rows:
+        model = make_model(rows)
+        as_json, as_msgpack = _json_encode(model), _msgpack_encode(model)
+        report[f"rows_{rows}"] = {
+            "json": {
+                "bytes": len(as_json),
+                "encode_us": _time_us(lambda: _json_encode(model), args.min_seconds),
+                "decode_us": _time_us(lambda: json.loads(as_json), args.min_seconds),
+            },
+            "msgpack": {
+                "bytes": len(as_msgpack),
+                "encode_us": _time_us(lambda: _msgpack_encode(model), args.min_seconds),
+                "decode_us": _time_us(lambda: msgpack.unpackb(as_msgpack, raw=False), args.min_seconds),
+            },
+            "size_ratio": round(len(as_msgpack) / len(as_json), 3),
+        }
+    return {"rows": report}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("msgpack_codec", __doc__, add_arguments, scenario, argv, show="rows")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Keyset (cursor) pagination vs OFFSET paging at increasing page depth.
+
+Drives DB_Interface.finddb1_page against an in-memory SQLite table holding one
+hot key with many rows (indexed on columnname, column2name, id). Oracle-only
+syntax is rewritten for SQLite (FETCH FIRST n ROWS ONLY -> LIMIT n). OFFSET
+latency grows with depth because skipped rows are still walked; keyset stays flat.
+
+Usage:
+    python -m benchmarks.pagination --rows 200000 --limit 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sqlite3
+import sys
+import time
+from typing import Any, Iterable, Optional
+
+from benchmarks.common import FakeMakeConnection, percentile, run_benchmark
+from src.main.services.database.db_interface import DB_Interface
+
+logger = logging.getLogger(__name__)
+
+HOT_KEY = "hot"
+
+OFFSET_SQL = """
+    SELECT *
+    FROM DBNAME
+    WHERE columnname = :1
+    ORDER BY column2name DESC, id DESC
+    OFFSET :2 ROWS FETCH NEXT :3 ROWS ONLY
+""".strip()
+
+_FETCH_FIRST = re.compile(r"FETCH (?:FIRST|NEXT) (:\d+) ROWS ONLY", re.IGNORECASE)
+_OFFSET = re.compile(r"OFFSET (:\d+) ROWS\s+LIMIT (:\d+)", re.IGNORECASE)
+_NUMBERED_BIND = re.compile(r":(\d+)")
+
+
+class SqliteMakeConnection(FakeMakeConnection):
+    """
+    MakeConnection over sqlite3 with Oracle row-limiting clauses translated.
+    `:N` binds become `?N` so they bind by number, not by order of appearance.
+    """
+
+    def __init__(self, db: sqlite3.Connection) -> None:
+        super().__init__()
+        self.db = db
+
+    @staticmethod
+    def _translate(sql: Any) -> str:
+        sql = _FETCH_FIRST.sub(r"LIMIT \1", str(sql))  # str or registered Statement
+        sql = _OFFSET.sub(r"LIMIT \2 OFFSET \1", sql)
+        return _NUMBERED_BIND.sub(r"?\1", sql)
+
+    def query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
+        cur = self.db.execute(self._translate(sql), tuple(params or ()))
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def build_db(rows: int) -> sqlite3.Connection:
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.execute("CREATE TABLE DBNAME (ID INTEGER PRIMARY KEY, COLUMNNAME TEXT, COLUMN2NAME TEXT, PAYLOAD TEXT)")
+    db.executemany(
+        "INSERT INTO DBNAME VALUES (?, ?, ?, ?)",
+        (
+            (i, HOT_KEY, f"2024-01-{1 + i % 28:02d} {i % 24:02d}:00:00", "x" * 64)
+            for i in range(rows)
+        ),
+    )
+    db.execute("CREATE INDEX ix_dbname_seek ON DBNAME (COLUMNNAME, COLUMN2NAME, ID)")
+    db.commit()
+    return db
+
+
+def _time_ms(fn: Any, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return round(percentile(sorted(samples), 50) * 1000.0, 3)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 10, 100, 1000, 3000])
+    parser.add_argument("--repeat", type=int, default=20, help="timed fetches per depth (median reported)")
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    conn = SqliteMakeConnection(build_db(args.rows))
+    db = DB_Interface(dsn="bench", user="bench", password="bench")
+    db.conn = conn
+
+    # Walk keyset pages once, remembering the cursor that starts each requested depth
+    wanted, cursors = set(args.depths), {}
+    cursor: Optional[str] = None
+    for page in range(1, max(args.depths) + 1):
+        if page in wanted:
+            cursors[page] = cursor
+        rows, cursor = db.finddb1_page(HOT_KEY, limit=args.limit, cursor=cursor)
+        if cursor is None:
+            break
+
+    report: dict[str, Any] = {}
+    for depth in args.depths:
+        if depth not in cursors:
+            logger.warning("Table too small for page %d; skipping", depth)
+            continue
+        offset = (depth - 1) * args.limit
+        report[f"page_{depth}"] = {
+            "keyset_ms": _time_ms(lambda: db.finddb1_page(HOT_KEY, limit=args.limit, cursor=cursors[depth]), args.repeat),
+            "offset_ms": _time_ms(lambda: conn.query(OFFSET_SQL, (HOT_KEY, offset, args.limit)), args.repeat),
+        }
+    return {"config": {"rows": args.rows, "limit": args.limit}, "pages": report}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("pagination", __doc__, add_arguments, scenario, argv, show="pages")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+SharedMemoryCache vs per-process caches.
+
+1. Single process: get (hit/miss) and set throughput for a plain dict,
+   LocalCache and SharedMemoryCache.
+2. N worker processes doing read-through lookups of the same keys against a
+   fake DB with injected latency: per-process caches load every key N times,
+   the shared cache roughly once.
+
+Usage:
+    python -m benchmarks.shm_cache --processes 4 --keys 500 --db-latency-ms 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.common import run_benchmark
+from src.main.services.cache import LocalCache, SharedMemoryCache
+
+logger = logging.getLogger(__name__)
+
+SLOTS = 8192
+SLOT_SIZE = 1024
+
+
+def _row(i: int) -> list[dict[str, Any]]:
+    return [{"id": i, "columnname": f"key-{i}", "column2name": "2024-01-01 00:00:00"}]
+
+
+def _ops_per_sec(fn: Any, keys: list[str]) -> float:
+    t0 = time.perf_counter()
+    for k in keys:
+        fn(k)
+    return round(len(keys) / (time.perf_counter() - t0), 1)
+
+
+def micro(path: Path, n: int) -> dict[str, Any]:
+    keys = [f"finddb1:key-{i}" for i in range(n)]
+    misses = [f"finddb1:none-{i}" for i in range(n)]
+    plain: dict[str, Any] = {}
+    backends = {
+        "dict": (plain, lambda k, v: plain.__setitem__(k, v)),
+        "local": (LocalCache(), None),
+        "shm": (SharedMemoryCache(path, slots=SLOTS, slot_size=SLOT_SIZE), None),
+    }
+    report: dict[str, Any] = {}
+    for name, (cache, setter) in backends.items():
+        setter = setter or cache.set
+        report[name] = {
+            "set_ops": _ops_per_sec(lambda k: setter(k, _row(0)), keys),
+            "get_hit_ops": _ops_per_sec(cache.get, keys),
+            "get_miss_ops": _ops_per_sec(cache.get, misses),
+        }
+    backends["shm"][0].close()
+    return report
+
+
+def _worker(backend: str, path: str, index: int, processes: int, keys: int, rounds: int, latency_s: float) -> tuple[int, float]:
+    if backend == "shm":
+        cache: Any = SharedMemoryCache(path, slots=SLOTS, slot_size=SLOT_SIZE)
+    else:
+        cache = LocalCache()
+    loads = 0
+    t0 = time.perf_counter()
+    offset = index * keys // processes  # workers see the key space in different orders
+    for _ in range(rounds):
+        for j in range(keys):
+            i = (offset + j) % keys
+            key = f"finddb1:key-{i}"
+            if cache.get(key) is None:
+                time.sleep(latency_s)  # simulated DB round trip
+                loads += 1
+                cache.set(key, _row(i))
+    return loads, time.perf_counter() - t0
+
+
+def multi(path: Path, processes: int, keys: int, rounds: int, latency_ms: float) -> dict[str, Any]:
+    report: dict[str, Any] = {}
+    ctx = multiprocessing.get_context("spawn")
+    for backend in ("local", "shm"):
+        if backend == "shm":
+            shared = SharedMemoryCache(path, slots=SLOTS, slot_size=SLOT_SIZE)
+            shared.clear()
+            shared.close()
+        wall0 = time.perf_counter()
+        with ctx.Pool(processes) as pool:
+            outcomes = pool.starmap(
+                _worker,
+                [(backend, str(path), idx, processes, keys, rounds, latency_ms / 1000.0) for idx in range(processes)],
+            )
+        report[backend] = {
+            "db_loads": sum(loads for loads, _ in outcomes),
+            "wall_s": round(time.perf_counter() - wall0, 3),
+            "slowest_worker_s": round(max(t for _, t in outcomes), 3),
+        }
+    return report
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--ops", type=int, default=50_000, help="operations per micro benchmark")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--keys", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            "micro_ops_per_sec": micro(Path(tmp) / "micro.cache", args.ops),
+            "multi_process": multi(Path(tmp) / "multi.cache", args.processes, args.keys, args.rounds, args.db_latency_ms),
+        }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("shm_cache", __doc__, add_arguments, scenario, argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
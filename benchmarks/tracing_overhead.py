@@ -0,0 +1,66 @@
+"""
+Per-span overhead of src.main.utils.tracing, with sampling off and on.
+
+With no active trace (mode=off, or a request not head-sampled), `span()` and
+`@traced` must cost well under a microsecond.
+
+Usage:
+    python -m benchmarks.tracing_overhead --iterations 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from typing import Any, Optional
+
+from benchmarks.common import run_benchmark
+from src.main.utils import tracing
+
+
+def _bare() -> int:
+    return 1
+
+
+@tracing.traced("bench")
+def _decorated() -> int:
+    return 1
+
+
+def _with_span() -> int:
+    with tracing.span("bench"):
+        return 1
+
+
+def _ns_per_call(fn: Any, iterations: int) -> float:
+    # Best of 5, minus the cost of calling the bare function
+    best = min(timeit.repeat(fn, number=iterations, repeat=5))
+    base = min(timeit.repeat(_bare, number=iterations, repeat=5))
+    return round((best - base) / iterations * 1e9, 1)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "off_span_ns": _ns_per_call(_with_span, args.iterations),
+        "off_traced_ns": _ns_per_call(_decorated, args.iterations),
+    }
+
+    # Recording: spans accumulate on one trace, so keep the count modest
+    recording = min(args.iterations, 100_000)
+    with tracing.activate_trace(tracing.Trace("bench", {})):
+        report["on_span_ns"] = _ns_per_call(_with_span, recording)
+        report["on_traced_ns"] = _ns_per_call(_decorated, recording)
+    return {"overhead": report}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("tracing_overhead", __doc__, add_arguments, scenario, argv, show="overhead")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Request validation throughput vs payload size for router1_basemodel.
+
+Compares the dict path FastAPI uses for body params (json.loads -> model_validate)
+with validating raw bytes directly (model_validate_json, cached TypeAdapter.validate_json,
+as used by request_util.json_body).
+
+Usage:
+    python -m benchmarks.validation --sizes 1 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from benchmarks.common import DEFAULT_PAYLOAD, run_benchmark
+from src.main.schemas.router1.basemodels import router1_basemodel
+from src.main.utils.request_util import get_adapter
+
+
+def make_payload(base: dict[str, Any], items: int) -> bytes:
+    """
+    Scale the list fields of payload.json to `items` entries each.
+    """
+    body = json.loads(json.dumps(base))
+    body["attribute2"]["attribute5"] = [f"  item-{i:06d}  " for i in range(items)]
+    if body.get("attribute3"):
+        body["attribute3"]["attribute2"] = [f"value-{i:06d}" for i in range(items)]
+    return json.dumps(body).encode("utf-8")
+
+
+def _rate(fn: Callable[[bytes], Any], raw: bytes, min_seconds: float) -> dict[str, float]:
+    fn(raw)  # warm-up
+    count, t0 = 0, time.perf_counter()
+    while True:
+        fn(raw)
+        count += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_seconds:
+            break
+    return {
+        "per_sec": round(count / elapsed, 1),
+        "us_per_call": round(elapsed / count * 1e6, 2),
+        "mb_per_sec": round(count * len(raw) / elapsed / 1e6, 2),
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--payload", type=Path, default=DEFAULT_PAYLOAD)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="items per list field")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="time spent per measurement")
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    base = json.loads(args.payload.read_text(encoding="utf-8"))
+    adapter = get_adapter(router1_basemodel)
+    paths = {
+        "dict": lambda raw: router1_basemodel.model_validate(json.loads(raw)),
+        "model_validate_json": router1_basemodel.model_validate_json,
+        "type_adapter": adapter.validate_json,
+    }
+
+    report: dict[str, Any] = {}
+    for items in args.sizes:
+        raw = make_payload(base, items)
+        report[f"items_{items}"] = {
+            "bytes": len(raw),
+            **{name: _rate(fn, raw, args.min_seconds) for name, fn in paths.items()},
+        }
+    return {"sizes": report}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("validation", __doc__, add_arguments, scenario, argv, show="sizes")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+First-N-request latency after a deploy, with and without the DB warm-up.
+
+The shared db_api gets a simulated pool: opening a connection costs
+`--connect-ms`, and the first execution of a statement on a connection costs
+`--parse-ms` (each connection keeps an LRU statement cache of
+`--stmt-cache-size`). "cold" serves the first requests straight away; "warm"
+runs DB_Interface.warm_up() first, as the startup hook does.
+
+Usage:
+    python -m benchmarks.warmup --requests 50 --concurrency 8 --pool-min 8 --connect-ms 50 --parse-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from benchmarks.common import DEFAULT_PAYLOAD, FakeMakeConnection, run_benchmark, summarize
+
+HEADERS = {"header_1": "bench", "header_2": "bench"}
+
+
+class _FakeConn:
+    def __init__(self, cache_size: int) -> None:
+        self.cache: OrderedDict[str, None] = OrderedDict()
+        self.cache_size = cache_size
+
+
+class PooledFakeConnection(FakeMakeConnection):
+    """
+    FakeMakeConnection with a connection pool, connect cost and per-connection statement cache.
+    """
+
+    def __init__(self, connect_ms: float, parse_ms: float, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connect_s = connect_ms / 1000.0
+        self.parse_s = parse_ms / 1000.0
+        self._idle: list[_FakeConn] = []
+        self._lock = threading.Lock()
+        self.stats = {"connects": 0, "parses": 0, "cache_hits": 0}
+
+    def _acquire(self, timeout: Optional[float] = None) -> _FakeConn:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.stats["connects"] += 1
+        time.sleep(self.connect_s)
+        return _FakeConn(self.stmt_cache_size)
+
+    def _release(self, conn: _FakeConn) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def _prepare(self, conn: _FakeConn, statement: Any) -> None:
+        sql = str(statement)
+        if sql in conn.cache:
+            conn.cache.move_to_end(sql)
+            self.stats["cache_hits"] += 1
+            return
+        self.stats["parses"] += 1
+        time.sleep(self.parse_s)
+        conn.cache[sql] = None
+        if len(conn.cache) > conn.cache_size:
+            conn.cache.popitem(last=False)
+
+    def _run(self, sql: Any) -> None:
+        conn = self._acquire()
+        try:
+            self._prepare(conn, sql)
+            self._wait()
+        finally:
+            self._release(conn)
+
+    def query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
+        self._run(sql)
+        return list(self.rows)
+
+    def non_query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> int:
+        self._run(sql)
+        return 1
+
+    def iter_query(self, sql: Any, params: Optional[Iterable[Any]] = None, batch_size: int = 10000) -> Iterator[dict[str, Any]]:
+        self._run(sql)
+        yield from self.rows
+
+
+async def _first_requests(app: Any, payload: Any, n: int, concurrency: int) -> list[float]:
+    import httpx
+
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(i: int) -> float:
+            async with sem:
+                t0 = time.perf_counter()
+                if i % 2:
+                    resp = await client.post("/router1/posturl", json=payload, headers=HEADERS)
+                else:
+                    resp = await client.get("/router1/geturl", params={"value": f"k{i}"}, headers=HEADERS)
+                resp.raise_for_status()
+                return time.perf_counter() - t0
+
+        return list(await asyncio.gather(*(one(i) for i in range(n))))
+
+
+def run(mode: str, args: argparse.Namespace, payload: Any) -> dict[str, Any]:
+    from src.main.main import create_app
+    from src.main.services.database import db_api
+
+    db_api.conn = PooledFakeConnection(
+        connect_ms=args.connect_ms,
+        parse_ms=args.parse_ms,
+        latency_ms=args.db_latency_ms,
+        pool_min=args.pool_min,
+        stmt_cache_size=args.stmt_cache_size,
+    )
+    report: dict[str, Any] = {}
+    if mode == "warm":
+        report["warm_up"] = db_api.warm_up()
+    app = create_app()
+    t0 = time.perf_counter()
+    latencies = asyncio.run(_first_requests(app, payload, args.requests, args.concurrency))
+    report["first_requests"] = summarize(latencies, time.perf_counter() - t0)
+    report["first_10_mean_ms"] = round(sum(latencies[:10]) / min(10, len(latencies)) * 1000.0, 3)
+    report["db"] = dict(db_api.conn.stats)
+    return report
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--payload", type=Path, default=DEFAULT_PAYLOAD)
+    parser.add_argument("--requests", type=int, default=50, help="first N requests to time")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-min", type=int, default=8)
+    parser.add_argument("--stmt-cache-size", type=int, default=40)
+    parser.add_argument("--connect-ms", type=float, default=50.0)
+    parser.add_argument("--parse-ms", type=float, default=5.0)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+
+
+def scenario(args: argparse.Namespace) -> dict[str, Any]:
+    payload = json.loads(args.payload.read_text(encoding="utf-8"))
+    # Untimed pass with free connects/parses, so neither mode pays Python's own first-call costs
+    prime = argparse.Namespace(**{**vars(args), "connect_ms": 0.0, "parse_ms": 0.0})
+    run("cold", prime, payload)
+    report = {mode: run(mode, args, payload) for mode in ("cold", "warm")}
+
+    params = {k: v for k, v in vars(args).items() if k not in ("output", "payload")}
+    return {"params": params, "results": report}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return run_benchmark("warmup", __doc__, add_arguments, scenario, argv, show="results")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
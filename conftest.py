@@ -0,0 +1,4 @@
+"""
+Root conftest: its presence puts the project root on sys.path, so tests under
+src/test import the app as `src.main...` whether run via `pytest` or `python -m pytest`.
+"""
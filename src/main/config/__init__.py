@@ -42,8 +42,8 @@ ComponentA_cfg = _parser["ComponentA"] if _parser.has_section("ComponentA") else
 def _apply_profile_overrides(parser: ConfigParser, profile_name: str) -> None:
     if not parser.has_section(profile_name):
         return
-    profile = parser[profile_name]
-    for key, value in profile.items():
+    # raw=True: copy values verbatim; ${ENV:...} placeholders are not ExtendedInterpolation keys
+    for key, value in parser.items(profile_name, raw=True):
         if "." in key:
             section, opt = key.split(".", 1)
             if not parser.has_section(section):
@@ -57,6 +57,12 @@ _apply_profile_overrides(_parser, APP_ENV)
 
 # Rebind after overrides so lookups include merged values
 ComponentA_cfg = _parser["ComponentA"] if _parser.has_section("ComponentA") else {}
+Database_cfg = _parser["Database"] if _parser.has_section("Database") else {}
+Executor_cfg = _parser["Executor"] if _parser.has_section("Executor") else {}
+Cache_cfg = _parser["Cache"] if _parser.has_section("Cache") else {}
+Tracing_cfg = _parser["Tracing"] if _parser.has_section("Tracing") else {}
+RequestLimits_cfg = _parser["RequestLimits"] if _parser.has_section("RequestLimits") else {}
+Deadlines_cfg = _parser["Deadlines"] if _parser.has_section("Deadlines") else {}
 
 # -------------------------
 # Secrets / env variables
@@ -91,6 +97,266 @@ class ApConfig(BaseSettings):
     )
 
 
+class DatabaseConfig(BaseSettings):
+    """
+    Connection pool, statement cache and startup warm-up (src/main/services/database).
+    Env precedence: environment > INI > defaults.
+    """
+
+    pool_min: int = Field(
+        default=Database_cfg.get("pool_min", "1"),
+        description="Connections opened (and warmed) at startup.",
+        validation_alias=AliasChoices("DB_POOL_MIN"),
+    )
+    pool_max: int = Field(
+        default=Database_cfg.get("pool_max", "10"),
+        description="Upper bound on pooled connections.",
+        validation_alias=AliasChoices("DB_POOL_MAX"),
+    )
+    pool_timeout_seconds: float = Field(
+        default=Database_cfg.get("pool_timeout_seconds", "15"),
+        description="Max wait for a pooled connection (request deadlines can shorten it).",
+        validation_alias=AliasChoices("DB_POOL_TIMEOUT_SECONDS"),
+    )
+    stmt_cache_size: int = Field(
+        default=Database_cfg.get("stmt_cache_size", "40"),
+        description="Prepared statements cached per connection.",
+        validation_alias=AliasChoices("DB_STMT_CACHE_SIZE"),
+    )
+    warm_up: bool = Field(
+        default=Database_cfg.get("warm_up", "true"),
+        description="Open pool_min connections and prepare statements at startup.",
+        validation_alias=AliasChoices("DB_WARM_UP"),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        extra="ignore",
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
+
+
+class ExecutorConfig(BaseSettings):
+    """
+    Settings for the CPU-bound process pool (src/main/services/executor).
+    Env precedence: environment > INI > defaults.
+    """
+
+    cpu_pool_enabled: bool = Field(
+        default=Executor_cfg.get("cpu_pool_enabled", "false"),
+        description="Offload @cpu_bound service functions to a process pool.",
+        validation_alias=AliasChoices("CPU_POOL_ENABLED"),
+    )
+    cpu_pool_workers: int = Field(
+        default=Executor_cfg.get("cpu_pool_workers", "2"),
+        description="Worker processes per app process (0 = os.cpu_count()).",
+        validation_alias=AliasChoices("CPU_POOL_WORKERS"),
+    )
+    cpu_pool_start_method: str = Field(
+        default=Executor_cfg.get("cpu_pool_start_method", "spawn"),
+        description="multiprocessing start method: spawn|forkserver|fork.",
+        validation_alias=AliasChoices("CPU_POOL_START_METHOD"),
+    )
+    cpu_pool_prewarm: bool = Field(
+        default=Executor_cfg.get("cpu_pool_prewarm", "true"),
+        description="Start all worker processes at app startup.",
+        validation_alias=AliasChoices("CPU_POOL_PREWARM"),
+    )
+    cpu_pool_timeout_seconds: float = Field(
+        default=Executor_cfg.get("cpu_pool_timeout_seconds", "10"),
+        description="Default per-call timeout for offloaded calls (0 = none).",
+        validation_alias=AliasChoices("CPU_POOL_TIMEOUT_SECONDS"),
+    )
+    cpu_pool_max_payload_bytes: int = Field(
+        default=Executor_cfg.get("cpu_pool_max_payload_bytes", "1048576"),
+        description="Max pickled argument size per call (0 = unlimited).",
+        validation_alias=AliasChoices("CPU_POOL_MAX_PAYLOAD_BYTES"),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        extra="ignore",
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
+
+
+class CacheConfig(BaseSettings):
+    """
+    Settings for read-through caching of DB lookups (src/main/services/cache).
+    Env precedence: environment > INI > defaults.
+    """
+
+    db_read_through: bool = Field(
+        default=Cache_cfg.get("db_read_through", "false"),
+        description="Cache DB_Interface.finddb1/finddb2 results.",
+        validation_alias=AliasChoices("DB_READ_THROUGH"),
+    )
+    db_cache_backend: str = Field(
+        default=Cache_cfg.get("db_cache_backend", "shm"),
+        description="shm (shared by all workers on the host) | local (per process).",
+        validation_alias=AliasChoices("DB_CACHE_BACKEND"),
+    )
+    default_ttl_seconds: float = Field(
+        default=Cache_cfg.get("default_ttl_seconds", "300"),
+        description="TTL for cached entries.",
+        validation_alias=AliasChoices("CACHE_DEFAULT_TTL_SECONDS"),
+    )
+    shm_path: str = Field(
+        default=Cache_cfg.get("shm_path", ""),
+        description="Backing file for the shm backend (empty = /dev/shm/webtemplate-db.cache).",
+        validation_alias=AliasChoices("CACHE_SHM_PATH"),
+    )
+    shm_slots: int = Field(
+        default=Cache_cfg.get("shm_slots", "4096"),
+        description="Number of fixed-size slots in the shm backend.",
+        validation_alias=AliasChoices("CACHE_SHM_SLOTS"),
+    )
+    shm_slot_bytes: int = Field(
+        default=Cache_cfg.get("shm_slot_bytes", "2048"),
+        description="Bytes per slot (key + pickled value must fit).",
+        validation_alias=AliasChoices("CACHE_SHM_SLOT_BYTES"),
+    )
+    existence_index_enabled: bool = Field(
+        default=Cache_cfg.get("existence_index_enabled", "false"),
+        description="Answer finddb2 misses from a Bloom filter over columnname.",
+        validation_alias=AliasChoices("EXISTENCE_INDEX_ENABLED"),
+    )
+    existence_index_fp_rate: float = Field(
+        default=Cache_cfg.get("existence_index_fp_rate", "0.01"),
+        description="Target false-positive rate of the Bloom filter.",
+        validation_alias=AliasChoices("EXISTENCE_INDEX_FP_RATE"),
+    )
+    existence_index_capacity: int = Field(
+        default=Cache_cfg.get("existence_index_capacity", "1000000"),
+        description="Expected number of distinct keys (initial filter size).",
+        validation_alias=AliasChoices("EXISTENCE_INDEX_CAPACITY"),
+    )
+    existence_index_path: str = Field(
+        default=Cache_cfg.get("existence_index_path", ""),
+        description="Snapshot file (empty = /dev/shm/webtemplate-finddb2.bloom).",
+        validation_alias=AliasChoices("EXISTENCE_INDEX_PATH"),
+    )
+    existence_index_rebuild_seconds: float = Field(
+        default=Cache_cfg.get("existence_index_rebuild_seconds", "3600"),
+        description="Rebuild the filter from the table at most this often.",
+        validation_alias=AliasChoices("EXISTENCE_INDEX_REBUILD_SECONDS"),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        extra="ignore",
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
+
+
+class RequestLimitsConfig(BaseSettings):
+    """
+    Request body size and collection limits (src/main/utils/request_util.py, router1 schemas).
+    Env precedence: environment > INI > defaults.
+    """
+
+    max_body_bytes: int = Field(
+        default=RequestLimits_cfg.get("max_body_bytes", "1048576"),
+        description="Max request body size in bytes (0 = unlimited).",
+        validation_alias=AliasChoices("MAX_BODY_BYTES"),
+    )
+    attribute5_max_items: int = Field(
+        default=RequestLimits_cfg.get("attribute5_max_items", "1000"),
+        description="Max items in router1 attribute2.attribute5.",
+        validation_alias=AliasChoices("ATTRIBUTE5_MAX_ITEMS"),
+    )
+    attribute2_max_items: int = Field(
+        default=RequestLimits_cfg.get("attribute2_max_items", "1000"),
+        description="Max items in router1 attribute3.attribute2.",
+        validation_alias=AliasChoices("ATTRIBUTE2_MAX_ITEMS"),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        extra="ignore",
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
+
+
+class DeadlineConfig(BaseSettings):
+    """
+    Request deadlines and cancellation (src/main/utils/deadline.py).
+    Env precedence: environment > INI > defaults.
+    """
+
+    header: str = Field(
+        default=Deadlines_cfg.get("header", "X-Request-Timeout"),
+        description="Request header carrying the client's timeout in seconds.",
+        validation_alias=AliasChoices("DEADLINE_HEADER"),
+    )
+    default_seconds: float = Field(
+        default=Deadlines_cfg.get("default_seconds", "0"),
+        description="Budget for requests without the header (0 = none).",
+        validation_alias=AliasChoices("DEADLINE_DEFAULT_SECONDS"),
+    )
+    max_seconds: float = Field(
+        default=Deadlines_cfg.get("max_seconds", "60"),
+        description="Cap for client-supplied timeouts (0 = no cap).",
+        validation_alias=AliasChoices("DEADLINE_MAX_SECONDS"),
+    )
+    cancel_on_disconnect: bool = Field(
+        default=Deadlines_cfg.get("cancel_on_disconnect", "true"),
+        description="Cancel in-flight work when the client disconnects.",
+        validation_alias=AliasChoices("DEADLINE_CANCEL_ON_DISCONNECT"),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        extra="ignore",
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
+
+
+class TracingConfig(BaseSettings):
+    """
+    Settings for request tracing (src/main/utils/tracing.py).
+    Env precedence: environment > INI > defaults.
+    """
+
+    mode: str = Field(
+        default=Tracing_cfg.get("mode", "off"),
+        description="off | head | tail sampling.",
+        validation_alias=AliasChoices("TRACING_MODE"),
+    )
+    sample_rate: float = Field(
+        default=Tracing_cfg.get("sample_rate", "0.01"),
+        description="Fraction of requests recorded in head mode.",
+        validation_alias=AliasChoices("TRACING_SAMPLE_RATE"),
+    )
+    tail_threshold_ms: float = Field(
+        default=Tracing_cfg.get("tail_threshold_ms", "500"),
+        description="Tail mode: export traces at least this slow (failed ones always).",
+        validation_alias=AliasChoices("TRACING_TAIL_THRESHOLD_MS"),
+    )
+    slowest_size: int = Field(
+        default=Tracing_cfg.get("slowest_size", "50"),
+        description="Number of slowest traces kept in memory.",
+        validation_alias=AliasChoices("TRACING_SLOWEST_SIZE"),
+    )
+    export_path: str = Field(
+        default=Tracing_cfg.get("export_path", ""),
+        description="JSON-lines export file (empty = no export).",
+        validation_alias=AliasChoices("TRACING_EXPORT_PATH"),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="",
+        extra="ignore",
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
+
+
 class Settings(BaseSettings):
     """
     Top-level application settings.
@@ -109,6 +375,12 @@ class Settings(BaseSettings):
 
     # Nest module configs
     componentA: ApConfig = ApConfig()
+    executor: ExecutorConfig = ExecutorConfig()
+    cache: CacheConfig = CacheConfig()
+    tracing: TracingConfig = TracingConfig()
+    request_limits: RequestLimitsConfig = RequestLimitsConfig()
+    deadlines: DeadlineConfig = DeadlineConfig()
+    database: DatabaseConfig = DatabaseConfig()
 
     model_config = SettingsConfigDict(
         env_prefix="",      # no global prefix
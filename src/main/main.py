@@ -8,6 +8,7 @@ import logging
 from typing import Optional, Dict
 
 from fastapi import FastAPI, Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 # Routers (adjust the import path to your project layout)
@@ -16,6 +17,12 @@ from src.main.routers.router1 import router1_router
 
 # Settings (Pydantic v2)
 from src.main.config import get_settings
+from src.main.services.database import db_api
+from src.main.services.executor import cpu_pool
+from src.main.utils.deadline import DeadlineMiddleware
+from src.main.utils.negotiation import ContentNegotiationMiddleware, install_msgpack_openapi
+from src.main.utils.request_util import BodySizeLimitMiddleware
+from src.main.utils.tracing import TracingMiddleware, set_trace_id, tracer
 
 
 logger = logging.getLogger("uvicorn.error")
@@ -41,6 +48,7 @@ def required_headers(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Missing required header(s): {', '.join(missing)}",
             )
+    set_trace_id(header_2)  # header_2 doubles as the trace/correlation id
     return {"header_1": header_1, "header_2": header_2}
 
 
@@ -71,7 +79,20 @@ def create_app() -> FastAPI:
         dependencies=[Depends(required_headers)],  # enforce headers for all routes
     )
 
-    # CORS (adjust origins)
+    # Added innermost-first: each add_middleware() wraps everything added before it.
+    # Reject oversized bodies before anything buffers them
+    app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=settings.request_limits.max_body_bytes)
+    # Deadline clock starts here; 504 once it is spent, cancel on client disconnect
+    app.add_middleware(
+        DeadlineMiddleware,
+        header=settings.deadlines.header,
+        default_seconds=settings.deadlines.default_seconds,
+        max_seconds=settings.deadlines.max_seconds,
+        cancel_on_disconnect=settings.deadlines.cancel_on_disconnect,
+    )
+    # Accept: application/msgpack -> handle_resp() answers in msgpack (the 413/504 above included)
+    app.add_middleware(ContentNegotiationMiddleware)
+    # CORS (adjust origins); wraps the middlewares above so their own responses carry CORS headers
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -79,17 +100,35 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Outermost, so the root span covers CORS, routing and validation too
+    app.add_middleware(TracingMiddleware, tracer=tracer)
 
     # Include routers
     app.include_router(monitor_router, tags=["monitor"])
     app.include_router(router1_router, prefix="/router1", tags=["router1"])
+    install_msgpack_openapi(app)
 
     @app.on_event("startup")
     async def _on_startup():
         logger.info("[Startup] ENV=%s VERSION=%s", settings.app_env, getattr(settings, "app_version", "n/a"))
+        if settings.executor.cpu_pool_enabled:
+            cpu_pool.start()  # pre-warms workers before the app serves traffic
+        if settings.database.warm_up:
+            # Connect + parse now instead of on the first requests after a deploy
+            try:
+                await run_in_threadpool(db_api.warm_up)
+            except Exception:
+                logger.exception("[Startup] DB warm-up failed; connections will open on demand")
+        if db_api.existence_index is not None:
+            # Loads the snapshot or streams keys in the background; "maybe" until built
+            db_api.existence_index.start(db_api.iter_keys, settings.cache.existence_index_rebuild_seconds)
 
     @app.on_event("shutdown")
     async def _on_shutdown():
+        cpu_pool.shutdown()
+        if db_api.existence_index is not None:
+            db_api.existence_index.close()
+        tracer.close()
         logger.info("[Shutdown] Bye.")
 
     return app
@@ -9,6 +9,7 @@ from src.main.schemas import InternalServerErrorModel, SuccessResponseModel
 # Common responses map you can reuse for all routers
 RESPONSES_MODEL = {
     200: {"model": SuccessResponseModel, "description": "OK"},
+    413: {"model": InternalServerErrorModel, "description": "Request body too large ([RequestLimits] max_body_bytes)"},
     500: {"model": InternalServerErrorModel, "description": "Internal Server Error"},
 }
 
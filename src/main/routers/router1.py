@@ -2,19 +2,28 @@
 Example business router (Router1).
 """
 
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Depends, Query
 from fastapi_utils.cbv import cbv
 from . import router1_router
 
 from src.main.utils.resp_util import handle_resp
 from src.main.utils.decorator import handle_except
+from src.main.utils.conditional import conditional_get
+from src.main.utils.deadline import with_deadline
+from src.main.utils.request_util import json_body, json_body_openapi
 
-from src.main.schemas.router1.responsemodels import Router1ResponseModel
-from src.main.schemas.router1.basemodels import Router1BaseModel  # request model
+from src.main.schemas import InternalServerErrorModel
+from src.main.schemas.router1.responsemodels import Router1ResponseModel, Router1PageResponseModel
+from src.main.schemas.router1.basemodels import router1_basemodel  # request model
 
 from src.main.config import get_settings  # loads configs (from your earlier __init__.py)
 from src.main.services.router1.service_a import service_a
-from src.main.utils.router1.utils_a import utils_a
-from main.services.database.api import insert_db  # add other db functions as needed
+from src.main.utils.router1 import utils_a
+from src.main.services.database.api import insertdb, finddb1_page, finddb1_version  # add other db functions as needed
+from src.main.services.database.db_interface import MAX_PAGE_SIZE
 
 
 @cbv(router1_router)
@@ -23,16 +32,41 @@ class Router1API:
         "/posturl",
         summary="Process Router1 request",
         response_model=Router1ResponseModel,
+        openapi_extra=json_body_openapi(router1_basemodel),
     )
     @handle_except  # catches, logs, and re-raises as your standardized errors
-    def router1_post(self, request: Router1BaseModel):
+    @with_deadline(10.0)  # default budget unless the client sends X-Request-Timeout
+    def router1_post(self, request: router1_basemodel = Depends(json_body(router1_basemodel))):
         """
         Example POST endpoint showing service, utils, and DB usage.
         """
         settings = get_settings()  # access configs
         # domain logic
-        service_a(request.username)
-        utils_a()
-        insert_db(settings.componentA.compA_variable)  # example config use
+        service_a(request.attribute1)
+        utils_a.function1(request.attribute2.attribute1)
+        insertdb(settings.componentA.compA_variable, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))  # example config use
+
+        return handle_resp(Router1ResponseModel(data=[{"message": "success"}]))
 
-        return handle_resp(Router1ResponseModel(data={"message": "success"}))
+    @router1_router.get(
+        "/geturl",
+        summary="List Router1 rows (keyset paginated)",
+        response_model=Router1PageResponseModel,
+        responses={400: {"model": InternalServerErrorModel, "description": "Invalid or foreign cursor"}},
+    )
+    @handle_except
+    @conditional_get(cache_control="private, no-cache", version=lambda value, **_: finddb1_version(value))
+    def router1_get(
+        self,
+        value: str = Query(..., description="Value to look up."),
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Page size."),
+        cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page."),
+    ):
+        """
+        Example paginated GET: pass `next_cursor` back as `cursor` until it is null.
+        Responses carry an ETag; send it back as If-None-Match to get 304 when unchanged.
+        """
+        rows, next_cursor = finddb1_page(value, limit=limit, cursor=cursor)
+        return handle_resp(
+            Router1PageResponseModel(data=rows, limit=limit, cursor=cursor, next_cursor=next_cursor)
+        )
@@ -7,6 +7,7 @@ from .base import (
     BaseResponseModel,
     SuccessResponseModel,
     InternalServerErrorModel,
+    resolve_version,
 )
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "BaseResponseModel",
     "SuccessResponseModel",
     "InternalServerErrorModel",
+    "resolve_version",
 ]
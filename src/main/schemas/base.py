@@ -12,7 +12,7 @@ from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field, StrictStr, ConfigDict
 
 
-def _resolve_version() -> str:
+def resolve_version() -> str:
     """Try config settings, then APP_VERSION env var, then '1.0.0'."""
     try:
         from src.main.config import get_settings  # adjust path if needed
@@ -27,6 +27,7 @@ def _resolve_version() -> str:
 class ResultStatusEm(str, Enum):
     ok = "0"
     ng = "1"
+    timeout = "2"
 
 
 class BaseResponseModel(BaseModel):
@@ -34,11 +35,11 @@ class BaseResponseModel(BaseModel):
 
     status_code: ResultStatusEm = Field(
         default=ResultStatusEm.ok,
-        description="Result status: '0' for OK, '1' for NG.",
+        description="Result status: '0' for OK, '1' for NG, '2' for deadline exceeded.",
         examples=[ResultStatusEm.ok],
     )
     version: StrictStr = Field(
-        default_factory=_resolve_version,
+        default_factory=resolve_version,
         description="API/application version.",
         examples=["1.0.0"],
     )
@@ -9,6 +9,15 @@ from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
+def _max_items(name: str, default: int = 1000) -> int:
+    """Per-field collection limit from settings ([RequestLimits]), else `default`."""
+    try:
+        from src.main.config import get_settings  # adjust path if needed
+        return int(getattr(get_settings().request_limits, name))
+    except Exception:
+        return default
+
+
 class sub_basemodel1(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -16,14 +25,22 @@ class sub_basemodel1(BaseModel):
     attribute2: str = Field(..., examples=["value2"])
     attribute3: str = Field(..., examples=["value3"])
     attribute4: str = Field(..., examples=["value4"])
-    attribute5: List[str] = Field(default_factory=list, examples=[["a", "b", "c"]])
+    attribute5: List[str] = Field(
+        default_factory=list,
+        max_length=_max_items("attribute5_max_items"),
+        examples=[["a", "b", "c"]],
+    )
 
 
 class sub_basemodel2(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
     attribute1: Optional[str] = Field(None, examples=["optional-value"])
-    attribute2: Optional[List[str]] = Field(None, examples=[["x", "y"]])
+    attribute2: Optional[List[str]] = Field(
+        None,
+        max_length=_max_items("attribute2_max_items"),
+        examples=[["x", "y"]],
+    )
 
 
 class router1_basemodel(BaseModel):
@@ -4,7 +4,7 @@ Router1-specific response models — Pydantic v2.
 
 from __future__ import annotations
 
-from typing import Any, List
+from typing import Any, List, Optional
 
 from pydantic import Field
 
@@ -17,3 +17,21 @@ class Router1ResponseModel(BaseResponseModel):
         description="List payload for Router1 responses.",
         examples=[[{"id": 1, "name": "foo"}]],
     )
+
+
+class Router1PageResponseModel(Router1ResponseModel):
+    limit: int = Field(
+        default=100,
+        description="Page size requested.",
+        examples=[100],
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor this page was fetched with (None for the first page).",
+        examples=[None],
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor for the next page; None when this is the last page.",
+        examples=["eyJzIjoiZmluZGRiMTp...Ifx0.kWb3..."],
+    )
@@ -0,0 +1,8 @@
+"""
+Initialize cache backends for read-through caching (e.g., DB_Interface lookups).
+"""
+from .bloom import BloomFilter, bloom_parameters
+from .local_cache import LocalCache
+from .shm_cache import SharedMemoryCache, default_path
+
+__all__ = ["BloomFilter", "LocalCache", "SharedMemoryCache", "bloom_parameters", "default_path"]
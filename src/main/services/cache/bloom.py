@@ -0,0 +1,379 @@
+"""
+Cross-process Bloom filter backed by an mmap'd snapshot file.
+
+Used as an existence index in front of DB lookups: `might_contain(key)` is False
+only for keys that were never added, so definite misses skip the DB entirely.
+
+    file = header | journal (key hashes added during a rebuild) | bit array
+
+- Every worker maps the same file (MAP_SHARED), so `add()` in one worker is seen
+  by all of them, and the file itself is the snapshot: a restart re-attaches
+  instead of rescanning the table.
+- Bit positions use double hashing over a 128-bit blake2b digest (stable across
+  processes): idx_i = (h1 + i * h2) mod m.
+- Writers are serialized with flock() on the file plus a thread lock; reads take
+  no lock (bits are only ever set, never cleared, in a live file).
+- rebuild() streams all keys into a fresh file sized for the current key count,
+  replays keys added meanwhile from the journal, atomically replaces the snapshot
+  and marks the old file retired; other processes re-attach on their next call.
+- A file that was never built answers "maybe" for everything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: writers only serialized per process
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"BLOOMIX1"
+# magic, m_bits, k, capacity, count, fp_rate, built_at, retired, rebuilding, overflow, journal_len, added
+# count = distinct keys from the build scan; added = new keys since (re-inserts of known keys excluded)
+_HEADER = struct.Struct("<8sQIQQddBBBxIQ")
+_HEADER_SIZE = 128
+_COUNT_OFFSET = struct.calcsize("<8sQIQ")
+_BUILT_AT_OFFSET = struct.calcsize("<8sQIQQd")
+_RETIRED_OFFSET = struct.calcsize("<8sQIQQdd")
+_REBUILDING_OFFSET = _RETIRED_OFFSET + 1
+_OVERFLOW_OFFSET = _RETIRED_OFFSET + 2
+_JOURNAL_LEN_OFFSET = struct.calcsize("<8sQIQQddBBBx")
+_ADDED_OFFSET = struct.calcsize("<8sQIQQddBBBxI")
+_JOURNAL_ENTRY = struct.Struct("<QQ")
+_JOURNAL_SLOTS = 16384
+_DATA_OFFSET = _HEADER_SIZE + _JOURNAL_SLOTS * _JOURNAL_ENTRY.size
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+
+
+def bloom_parameters(capacity: int, fp_rate: float) -> tuple[int, int]:
+    """
+    Bits (m) and hash count (k) for `capacity` keys at false-positive rate `fp_rate`.
+    """
+    capacity = max(1, capacity)
+    fp_rate = min(max(fp_rate, 1e-9), 0.5)
+    m = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+    m = max(64, (m + 7) // 8 * 8)
+    k = max(1, round(m / capacity * math.log(2)))
+    return m, k
+
+
+def _hashes(key: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def _set_bits(buf: Any, m: int, k: int, h1: int, h2: int) -> bool:
+    """
+    Set the key's bits; True if any was unset (the key is new to this filter).
+    """
+    fresh = False
+    for i in range(k):
+        idx = (h1 + i * h2) % m
+        pos, bit = _DATA_OFFSET + (idx >> 3), 1 << (idx & 7)
+        if not buf[pos] & bit:
+            buf[pos] |= bit
+            fresh = True
+    return fresh
+
+
+class BloomFilter:
+    """
+    Existence index shared by all processes that open the same `path`.
+    `capacity`/`fp_rate` size the first build; rebuilds resize to the key count.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], capacity: int = 1_000_000, fp_rate: float = 0.01) -> None:
+        self.path = Path(path)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self._tlock = threading.Lock()
+        self._fd = -1
+        self._buf: Optional[mmap.mmap] = None
+        self._shape = (0, 0)  # (m, k) of _buf, swapped together with it
+        self._counters = {"lookups": 0, "definite_misses": 0, "false_positives": 0, "adds": 0, "rebuilds": 0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._attach()
+
+    # --- file handling ---
+
+    def _attach(self) -> None:
+        """
+        Map the current snapshot, creating an empty (not yet built) one if needed.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._flock(fd):
+                size = os.fstat(fd).st_size
+                if size == 0:
+                    m, k = bloom_parameters(self.capacity, self.fp_rate)
+                    size = _DATA_OFFSET + m // 8
+                    os.ftruncate(fd, size)
+                    with mmap.mmap(fd, _HEADER_SIZE) as head:
+                        _HEADER.pack_into(head, 0, _MAGIC, m, k, self.capacity, 0, self.fp_rate, 0.0, 0, 0, 0, 0, 0)
+                elif size < _DATA_OFFSET or not self._layout_ok(fd, size):
+                    raise ValueError(f"{self.path} is not a Bloom index snapshot; use another path")
+                buf = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        old_fd = self._fd
+        # Readers may still hold the old mapping; it is released when they drop it
+        self._fd, self._buf, self._shape = fd, buf, _HEADER.unpack_from(buf, 0)[1:3]
+        if old_fd >= 0:
+            os.close(old_fd)
+
+    @staticmethod
+    def _layout_ok(fd: int, size: int) -> bool:
+        with mmap.mmap(fd, _HEADER_SIZE, access=mmap.ACCESS_READ) as head:
+            magic, m = _HEADER.unpack_from(head, 0)[:2]
+        return magic == _MAGIC and size == _DATA_OFFSET + m // 8
+
+    def _refresh(self) -> mmap.mmap:
+        """
+        Re-attach if another process replaced the snapshot.
+        """
+        buf = self._buf
+        if buf is None:
+            raise ValueError("BloomFilter is closed")
+        if buf[_RETIRED_OFFSET]:
+            with self._tlock:
+                if self._buf is not None and self._buf[_RETIRED_OFFSET]:
+                    self._attach()
+            buf = self._buf
+        return buf
+
+    def _view(self) -> tuple[mmap.mmap, int, int]:
+        buf = self._refresh()
+        shape = self._shape
+        if buf is not self._buf:  # re-attached concurrently; take the matching pair
+            return self._view()
+        return buf, shape[0], shape[1]
+
+    @staticmethod
+    @contextmanager
+    def _flock(fd: int, blocking: bool = True) -> Iterator[bool]:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[mmap.mmap]:
+        """
+        Lock the current snapshot for writing (re-attaching if it was retired meanwhile).
+        """
+        with self._tlock:
+            while True:
+                fd = self._fd
+                with self._flock(fd):
+                    if self._buf is not None and not self._buf[_RETIRED_OFFSET]:
+                        yield self._buf
+                        return
+                self._attach()
+
+    # --- public API ---
+
+    @property
+    def ready(self) -> bool:
+        """
+        False until the first build finished; an unbuilt filter never reports a miss.
+        """
+        return self.built_at > 0
+
+    @property
+    def built_at(self) -> float:
+        return _F64.unpack_from(self._refresh(), _BUILT_AT_OFFSET)[0]
+
+    def might_contain(self, key: str) -> bool:
+        buf, m, k = self._view()
+        self._counters["lookups"] += 1
+        if not _F64.unpack_from(buf, _BUILT_AT_OFFSET)[0]:
+            return True
+        h1, h2 = _hashes(key)
+        for i in range(k):
+            idx = (h1 + i * h2) % m
+            if not buf[_DATA_OFFSET + (idx >> 3)] & (1 << (idx & 7)):
+                self._counters["definite_misses"] += 1
+                return False
+        return True
+
+    __contains__ = might_contain
+
+    def add(self, key: str) -> None:
+        h1, h2 = _hashes(key)
+        with self._write_lock() as buf:
+            m, k = self._shape
+            if _set_bits(buf, m, k, h1, h2):
+                _U64.pack_into(buf, _ADDED_OFFSET, _U64.unpack_from(buf, _ADDED_OFFSET)[0] + 1)
+            if buf[_REBUILDING_OFFSET]:
+                # A rebuild is scanning the table; make sure the new file gets this key too
+                # (even if its bits are already set here: that may be a false positive)
+                n = _U32.unpack_from(buf, _JOURNAL_LEN_OFFSET)[0]
+                if n < _JOURNAL_SLOTS:
+                    _JOURNAL_ENTRY.pack_into(buf, _HEADER_SIZE + n * _JOURNAL_ENTRY.size, h1, h2)
+                    _U32.pack_into(buf, _JOURNAL_LEN_OFFSET, n + 1)
+                else:
+                    buf[_OVERFLOW_OFFSET] = 1
+        self._counters["adds"] += 1
+
+    def record_false_positive(self) -> None:
+        """
+        Call when might_contain() said yes but the source of truth said no.
+        """
+        self._counters["false_positives"] += 1
+
+    def rebuild(self, keys: Iterable[str]) -> bool:
+        """
+        Stream `keys` into a fresh snapshot and swap it in. The new file is sized for
+        max(capacity, 1.25 x the current key estimate). Returns False if another process
+        is already rebuilding or too many keys were added during the scan.
+        """
+        lock_fd = os.open(f"{self.path}.rebuild-lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._flock(lock_fd, blocking=False) as acquired:
+                if not acquired:
+                    return False
+                return self._rebuild_locked(keys)
+        finally:
+            os.close(lock_fd)
+
+    def _rebuild_locked(self, keys: Iterable[str]) -> bool:
+        with self._write_lock() as buf:
+            buf[_REBUILDING_OFFSET] = 1
+            buf[_OVERFLOW_OFFSET] = 0
+            _U32.pack_into(buf, _JOURNAL_LEN_OFFSET, 0)
+            current = _U64.unpack_from(buf, _COUNT_OFFSET)[0] + _U64.unpack_from(buf, _ADDED_OFFSET)[0]
+        capacity = max(self.capacity, math.ceil(current * 1.25))
+        m, k = bloom_parameters(capacity, self.fp_rate)
+        size = _DATA_OFFSET + m // 8
+
+        swapped = False
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            with mmap.mmap(fd, size) as new:
+                count = added = 0
+                for key in keys:  # DISTINCT scan: each key counted once
+                    _set_bits(new, m, k, *_hashes(key))
+                    count += 1
+                with self._write_lock() as buf:
+                    journal_len = _U32.unpack_from(buf, _JOURNAL_LEN_OFFSET)[0]
+                    if buf[_OVERFLOW_OFFSET]:
+                        logger.warning("Bloom rebuild of %s skipped: too many inserts during the scan", self.path)
+                    else:
+                        # Keys inserted while we were scanning may be missing from `keys`
+                        # (only those the scan missed count as added)
+                        for n in range(journal_len):
+                            entry = _JOURNAL_ENTRY.unpack_from(buf, _HEADER_SIZE + n * _JOURNAL_ENTRY.size)
+                            added += _set_bits(new, m, k, *entry)
+                        _HEADER.pack_into(
+                            new, 0, _MAGIC, m, k, capacity, count, self.fp_rate, time.time(), 0, 0, 0, 0, added
+                        )
+                        new.flush()
+                        os.replace(tmp, self.path)
+                        buf[_RETIRED_OFFSET] = 1  # other processes re-attach on their next call
+                        swapped = True
+        finally:
+            os.close(fd)
+            if not swapped:
+                with self._write_lock() as buf:
+                    buf[_REBUILDING_OFFSET] = 0
+                tmp.unlink(missing_ok=True)
+        if not swapped:
+            return False
+        self._refresh()
+        self._counters["rebuilds"] += 1
+        logger.info("Bloom index %s rebuilt: %d keys, %d KiB, k=%d", self.path, count + added, m // 8 // 1024, k)
+        return True
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Per-process counters plus snapshot shape. `hit_rate` is the share of lookups
+        answered without the DB (definite misses).
+        """
+        header = _HEADER.unpack_from(self._refresh(), 0)
+        m, k, built_at = header[1], header[2], header[6]
+        count = header[4] + header[11]
+        lookups = self._counters["lookups"]
+        misses = self._counters["definite_misses"]
+        negatives = misses + self._counters["false_positives"]
+        return {
+            **self._counters,
+            "ready": built_at > 0,
+            "hit_rate": round(misses / lookups, 4) if lookups else 0.0,
+            "observed_fp_rate": round(self._counters["false_positives"] / negatives, 4) if negatives else 0.0,
+            "expected_fp_rate": round((1 - math.exp(-k * count / m)) ** k, 6) if count else 0.0,
+            "keys": count,
+            "bits": m,
+            "hashes": k,
+            "memory_bytes": _DATA_OFFSET + m // 8,
+            "age_seconds": round(time.time() - built_at, 1) if built_at else None,
+        }
+
+    # --- periodic rebuild ---
+
+    def start(self, load_keys: Callable[[], Iterable[str]], rebuild_interval: float) -> None:
+        """
+        Background thread: build now if the snapshot is missing or older than
+        `rebuild_interval` seconds, then keep it at most that old. Only one
+        process per snapshot rebuilds at a time; the others pick it up.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.is_set():
+                built_at = self.built_at
+                due = built_at + rebuild_interval - time.time()
+                if not built_at or due <= 0:
+                    try:
+                        self.rebuild(load_keys())
+                    except Exception:
+                        logger.exception("Bloom index rebuild failed for %s", self.path)
+                    due = rebuild_interval if self.ready else min(60.0, rebuild_interval)
+                self._stop.wait(max(1.0, due))
+
+        self._thread = threading.Thread(target=loop, name="bloom-rebuild", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        with self._tlock:
+            if self._buf is not None:
+                self._buf.close()
+                self._buf = None
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
@@ -0,0 +1,66 @@
+"""
+Per-process TTL cache over a plain dict (same API as SharedMemoryCache).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import MutableMapping
+from typing import Any, Iterator, Optional
+
+_MISSING = object()
+
+
+class LocalCache(MutableMapping):
+    """
+    In-process cache: fastest lookups, but every worker holds (and warms) its own copy.
+    """
+
+    def __init__(self, default_ttl: float = 300.0, max_entries: int = 0) -> None:
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._data: dict[str, tuple[float, Any]] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires and expires < time.time():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if self.max_entries and key not in self._data and len(self._data) >= self.max_entries:
+            self._data.pop(next(iter(self._data)))  # drop the oldest insert
+        self._data[key] = (time.time() + ttl if ttl else 0.0, value)
+
+    def delete(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def close(self) -> None:
+        self._data.clear()
@@ -0,0 +1,288 @@
+"""
+Cross-process cache backed by an mmap'd file (one warm copy per host).
+
+Every uvicorn worker maps the same file, so a value loaded by one worker is a
+hit for all of them. Layout: a small header followed by fixed-size slots.
+
+    slot = seq:u32 | key_hash:u64 | expires_at:f64 | ref:u8 | pad | key_len:u16 | val_len:u32 | key | value
+
+- Keys are str, hashed with blake2b (stable across processes) into a probe
+  window of `probe` consecutive slots.
+- Reads are lock-free seqlock reads: `seq` is odd while a writer is mid-update,
+  and a read is retried if `seq` changed underneath it. A failed read is a miss.
+- Writers are serialized with flock() on the file plus a thread lock.
+- Entries expire after their TTL; when a window is full, CLOCK (second chance)
+  picks the victim using the `ref` bit that reads set.
+- Values are pickled; anything larger than a slot is rejected with ValueError.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: writers only serialized per process
+    fcntl = None  # type: ignore[assignment]
+
+_MAGIC = b"SHMCACH1"
+_HEADER = struct.Struct("<8sIII")  # magic, slots, slot_size, clock_hand
+_HEADER_SIZE = 64
+_SLOT_HDR = struct.Struct("<IQdBxHI")  # seq, key_hash, expires_at, ref, key_len, val_len
+_SEQ = struct.Struct("<I")
+_REF_OFFSET = 20
+_CLOCK_OFFSET = 16
+_MAX_READ_RETRIES = 16
+
+_MISSING = object()
+
+
+def default_path(name: str) -> Path:
+    """
+    Prefer tmpfs (/dev/shm) so the mapping never touches disk.
+    """
+    base = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+    return base / f"{name}.cache"
+
+
+def _key_hash(key: bytes) -> int:
+    h = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+    return h or 1  # 0 marks an empty slot
+
+
+class SharedMemoryCache(MutableMapping):
+    """
+    Mapping-like cache shared by all processes that open the same `path`.
+    The first process creates and sizes the file; others attach to it.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        slots: int = 4096,
+        slot_size: int = 2048,
+        probe: int = 8,
+        default_ttl: float = 300.0,
+    ) -> None:
+        if slot_size <= _SLOT_HDR.size:
+            raise ValueError(f"slot_size must exceed {_SLOT_HDR.size} bytes")
+        self.path = Path(path)
+        self.slots = slots
+        self.slot_size = slot_size
+        self.probe = max(1, min(probe, slots))
+        self.default_ttl = default_ttl
+        self.capacity = slot_size - _SLOT_HDR.size
+        self._tlock = threading.Lock()
+
+        total = _HEADER_SIZE + slots * slot_size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._buf: Optional[mmap.mmap] = None
+        with self._write_lock():
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                os.ftruncate(self._fd, total)
+            if size in (0, total):
+                self._buf = mmap.mmap(self._fd, total)
+                if size == 0:
+                    _HEADER.pack_into(self._buf, 0, _MAGIC, slots, slot_size, 0)
+                    size = total
+        layout_ok = size == total and _HEADER.unpack_from(self._buf, 0)[:3] == (_MAGIC, slots, slot_size)
+        if not layout_ok:
+            self.close()
+            raise ValueError(f"{self.path} was created with a different layout; use another path")
+
+    # --- locking ---
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with self._tlock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    # --- slot helpers ---
+
+    def _base(self, idx: int) -> int:
+        return _HEADER_SIZE + idx * self.slot_size
+
+    def _window(self, h: int) -> range:
+        start = h % self.slots
+        return range(start, start + self.probe)
+
+    def _read_slot(self, idx: int, h: Optional[int], kbytes: Optional[bytes], now: float) -> Any:
+        """
+        Seqlock read of one slot. With `h`/`kbytes`, return the raw value bytes on a
+        live match (and mark it referenced); with neither, return (key, value_bytes)
+        for any live entry without touching the ref bit, so iterating doesn't count as use.
+        """
+        buf, base = self._buf, self._base(idx)
+        for _ in range(_MAX_READ_RETRIES):
+            seq1, kh, expires, ref, klen, vlen = _SLOT_HDR.unpack_from(buf, base)
+            if seq1 & 1:
+                continue
+            if kh == 0 or (h is not None and kh != h):
+                return _MISSING
+            if klen + vlen > self.capacity:
+                continue  # torn header; re-read
+            start = base + _SLOT_HDR.size
+            data = buf[start:start + klen + vlen]
+            if _SEQ.unpack_from(buf, base)[0] != seq1:
+                continue
+            if expires and expires < now:
+                return _MISSING
+            if kbytes is not None and data[:klen] != kbytes:
+                return _MISSING
+            if kbytes is not None:
+                if not ref:
+                    buf[base + _REF_OFFSET] = 1  # racy by design; only guides eviction
+                return data[klen:]
+            return data[:klen].decode("utf-8"), data[klen:]
+        return _MISSING
+
+    def _write_slot(self, idx: int, h: int, expires: float, kbytes: bytes, payload: bytes) -> None:
+        # Caller holds the write lock
+        buf, base = self._buf, self._base(idx)
+        seq = _SEQ.unpack_from(buf, base)[0]
+        _SLOT_HDR.pack_into(buf, base, seq + 1, h, expires, 1, len(kbytes), len(payload))
+        start = base + _SLOT_HDR.size
+        buf[start:start + len(kbytes) + len(payload)] = kbytes + payload
+        _SEQ.pack_into(buf, base, (seq + 2) & 0xFFFFFFFF)
+
+    def _clear_slot(self, idx: int) -> None:
+        buf, base = self._buf, self._base(idx)
+        seq = _SEQ.unpack_from(buf, base)[0]
+        _SLOT_HDR.pack_into(buf, base, seq + 1, 0, 0.0, 0, 0, 0)
+        _SEQ.pack_into(buf, base, (seq + 2) & 0xFFFFFFFF)
+
+    def _slot_key(self, idx: int) -> bytes:
+        base = self._base(idx)
+        _, _, _, _, klen, _ = _SLOT_HDR.unpack_from(self._buf, base)
+        start = base + _SLOT_HDR.size
+        return self._buf[start:start + klen]
+
+    def _pick_slot(self, h: int, kbytes: bytes, now: float) -> int:
+        """
+        Choose where to write `kbytes` (caller holds the write lock): the slot already
+        holding the key, else an empty/expired slot, else a CLOCK victim.
+        """
+        free = None
+        window = [i % self.slots for i in self._window(h)]
+        for idx in window:
+            _, kh, expires, _, _, _ = _SLOT_HDR.unpack_from(self._buf, self._base(idx))
+            if kh == h and self._slot_key(idx) == kbytes:
+                return idx
+            if free is None and (kh == 0 or (expires and expires < now)):
+                free = idx
+        if free is not None:
+            return free
+
+        hand = _SEQ.unpack_from(self._buf, _CLOCK_OFFSET)[0]
+        for step in range(2 * len(window)):
+            idx = window[(hand + step) % len(window)]
+            ref_at = self._base(idx) + _REF_OFFSET
+            if self._buf[ref_at]:
+                self._buf[ref_at] = 0  # second chance
+                continue
+            _SEQ.pack_into(self._buf, _CLOCK_OFFSET, (hand + step + 1) & 0xFFFFFFFF)
+            return idx
+        return window[hand % len(window)]  # unreachable: second pass always finds ref == 0
+
+    # --- public API ---
+
+    def get(self, key: str, default: Any = None) -> Any:
+        kbytes = key.encode("utf-8")
+        h, now = _key_hash(kbytes), time.time()
+        for i in self._window(h):
+            raw = self._read_slot(i % self.slots, h, kbytes, now)
+            if raw is not _MISSING:
+                return pickle.loads(raw)
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` for `ttl` seconds (default_ttl if None, 0 = no expiry).
+        """
+        kbytes = key.encode("utf-8")
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(kbytes) + len(payload) > self.capacity:
+            raise ValueError(
+                f"entry for {key!r} is {len(kbytes) + len(payload)} bytes; slot capacity is {self.capacity}"
+            )
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl else 0.0
+        h = _key_hash(kbytes)
+        with self._write_lock():
+            self._write_slot(self._pick_slot(h, kbytes, now), h, expires, kbytes, payload)
+
+    def delete(self, key: str) -> bool:
+        kbytes = key.encode("utf-8")
+        h = _key_hash(kbytes)
+        with self._write_lock():
+            for i in self._window(h):
+                idx = i % self.slots
+                _, kh, _, _, _, _ = _SLOT_HDR.unpack_from(self._buf, self._base(idx))
+                if kh == h and self._slot_key(idx) == kbytes:
+                    self._clear_slot(idx)
+                    return True
+        return False
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        now = time.time()
+        for idx in range(self.slots):
+            entry = self._read_slot(idx, None, None, now)
+            if entry is not _MISSING:
+                yield entry[0]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def clear(self) -> None:
+        with self._write_lock():
+            for idx in range(self.slots):
+                self._clear_slot(idx)
+
+    def close(self) -> None:
+        if self._buf is not None and not self._buf.closed:
+            self._buf.close()
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+    def unlink(self) -> None:
+        """
+        Remove the backing file (other processes keep their existing mapping).
+        """
+        self.path.unlink(missing_ok=True)
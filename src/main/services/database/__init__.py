@@ -3,7 +3,11 @@ Initialize a shared DB_Interface instance configured from app settings.
 """
 
 from __future__ import annotations
-from main.services.database.db_interface import DB_Interface
+import logging
+from typing import Any
+from src.main.services.database.db_interface import DB_Interface
+
+logger = logging.getLogger(__name__)
 
 # Prefer a central settings provider (pydantic v2)
 try:
@@ -15,10 +19,50 @@ try:
     _user = getattr(_settings, "database_user", "user")
     _password = getattr(_settings, "database_password", "password")
     # Extra options (pool size, timeouts, etc.)
-    _kwargs = dict()
+    _db_cfg = _settings.database
+    _kwargs: dict[str, Any] = dict(
+        pool_min=_db_cfg.pool_min,
+        pool_max=_db_cfg.pool_max,
+        acquire_timeout=_db_cfg.pool_timeout_seconds,
+        stmt_cache_size=_db_cfg.stmt_cache_size,
+    )
+    _cache_cfg = _settings.cache
 except Exception:
     # Fallback placeholders if settings aren’t ready at import time
-    _dsn, _user, _password, _kwargs = "db-host:1521/ORCLCDB", "user", "password", {}
+    _dsn, _user, _password, _kwargs, _cache_cfg = "db-host:1521/ORCLCDB", "user", "password", {}, None
+
+# Optional read-through cache for finddb1/finddb2. Opening it touches files
+# (e.g. an shm file left with another layout); on failure run uncached rather
+# than losing the DB settings above.
+if _cache_cfg is not None and _cache_cfg.db_read_through:
+    try:
+        from src.main.services.cache import LocalCache, SharedMemoryCache, default_path
+
+        if _cache_cfg.db_cache_backend == "shm":
+            _kwargs["cache"] = SharedMemoryCache(
+                _cache_cfg.shm_path or default_path("webtemplate-db"),
+                slots=_cache_cfg.shm_slots,
+                slot_size=_cache_cfg.shm_slot_bytes,
+                default_ttl=_cache_cfg.default_ttl_seconds,
+            )
+        else:
+            _kwargs["cache"] = LocalCache(default_ttl=_cache_cfg.default_ttl_seconds)
+        _kwargs["cache_ttl"] = _cache_cfg.default_ttl_seconds
+    except Exception:
+        logger.exception("DB read-through cache unavailable; continuing without it")
+
+# Optional Bloom filter in front of finddb2; same policy: finddb2 just queries the DB
+if _cache_cfg is not None and _cache_cfg.existence_index_enabled:
+    try:
+        from src.main.services.cache import BloomFilter, default_path
+
+        _kwargs["existence_index"] = BloomFilter(
+            _cache_cfg.existence_index_path or default_path("webtemplate-finddb2").with_suffix(".bloom"),
+            capacity=_cache_cfg.existence_index_capacity,
+            fp_rate=_cache_cfg.existence_index_fp_rate,
+        )
+    except Exception:
+        logger.exception("finddb2 existence index unavailable; continuing without it")
 
 db_api = DB_Interface(dsn=_dsn, user=_user, password=_password, **_kwargs)
 
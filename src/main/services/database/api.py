@@ -4,7 +4,7 @@ Routers/services import from here instead of touching the instance directly.
 """
 
 from __future__ import annotations
-from typing import Any
+from typing import Any, Optional
 from . import db_api
 
 
@@ -22,6 +22,20 @@ def finddb1(value: str) -> list[dict[str, Any]]:
     return db_api.finddb1(value=value)
 
 
+def finddb1_page(value: str, limit: int = 100, cursor: Optional[str] = None) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    Return one page of rows for the given value and the cursor for the next page.
+    """
+    return db_api.finddb1_page(value=value, limit=limit, cursor=cursor)
+
+
+def finddb1_version(value: str) -> Optional[str]:
+    """
+    Return a version token for the rows of the given value (None if unavailable).
+    """
+    return db_api.version_token(value=value)
+
+
 def finddb2(value: str) -> bool:
     """
     Return True if a row exists for the given value.
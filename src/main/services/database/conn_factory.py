@@ -4,7 +4,7 @@ Base class to open a DB connection for retrievers.
 
 from __future__ import annotations
 from typing import Any
-from main.services.database.conn_instance import MakeConnection
+from src.main.services.database.conn_instance import MakeConnection
 
 
 class WrapMakeConnection:
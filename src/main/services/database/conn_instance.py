@@ -5,10 +5,26 @@ Wrap your driver or pool here. Add context management to auto-close.
 
 from __future__ import annotations
 import logging
-from typing import Any, Iterable, Optional
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from src.main.utils.deadline import DeadlineExceededError, budget, deadline_exceeded
+from src.main.utils.tracing import span
+from .statements import Statement
 
 logger = logging.getLogger(__name__)
 
+SQL = Union[str, Statement]
+
+
+def _sql_text(sql: SQL) -> str:
+    return sql.sql if isinstance(sql, Statement) else sql
+
+
+def _sql_name(sql: SQL) -> str:
+    return sql.name if isinstance(sql, Statement) else "adhoc"
+
 
 class MakeConnection:
     """
@@ -21,15 +37,29 @@ class MakeConnection:
         self.user = user
         self.password = password
         self.kwargs = kwargs
-        # self.pool = create_pool(dsn=dsn, user=user, password=password, **kwargs)
+        # Upper bounds per call; a request deadline (utils/deadline.py) can only shorten them
+        self.acquire_timeout: Optional[float] = kwargs.get("acquire_timeout")
+        self.call_timeout: Optional[float] = kwargs.get("call_timeout")
+        self.pool_min = int(kwargs.get("pool_min", 1))
+        self.pool_max = int(kwargs.get("pool_max", 10))
+        # Prepared statements kept per connection (LRU); size it above the registry size
+        self.stmt_cache_size = int(kwargs.get("stmt_cache_size", 20))
+        # self.pool = oracledb.create_pool(
+        #     dsn=dsn, user=user, password=password,
+        #     min=self.pool_min, max=self.pool_max, increment=1,
+        #     stmtcachesize=self.stmt_cache_size,
+        #     getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        # )
         logger.debug("MakeConnection created for DSN=%s user=%s", dsn, user)
 
     # --- helpers ---
 
-    def _acquire(self):
+    def _acquire(self, timeout: Optional[float] = None):
         """
-        Acquire a connection from pool/driver.
+        Acquire a connection from pool/driver, waiting at most `timeout` seconds (None = pool default).
         """
+        # oracledb: pool created with getmode=oracledb.POOL_GETMODE_TIMEDWAIT
+        # self.pool.wait_timeout = int(timeout * 1000) if timeout is not None else 0
         # return self.pool.acquire()
         return object()  # placeholder
 
@@ -40,34 +70,124 @@ class MakeConnection:
         # self.pool.release(conn)
         return None
 
+    def _prepare(self, conn, statement: Statement) -> None:
+        """
+        Parse `statement` on `conn` so later executions hit the connection's statement cache.
+        """
+        # with conn.cursor() as cur:
+        #     cur.prepare(statement.sql)  # cached on close (stmtcachesize)
+        return None
+
+    @contextmanager
+    def _call_timeout(self, conn) -> Iterator[None]:
+        """
+        Bound the next driver round trip by the remaining request budget; a driver
+        error after the budget ran out is reported as DeadlineExceededError.
+        """
+        timeout = budget(self.call_timeout, "db.execute")
+        # oracledb: conn.call_timeout = int(timeout * 1000) if timeout is not None else 0
+        try:
+            yield
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            if timeout is not None and deadline_exceeded():
+                raise DeadlineExceededError(f"DB call exceeded the request deadline: {e}") from e
+            raise
+
     # --- public API ---
 
-    def query(self, sql: str, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
+    def query(self, sql: SQL, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
         """
         Execute a SELECT and return rows as list of dicts.
         """
-        conn = self._acquire()
+        with span("db.acquire"):
+            conn = self._acquire(timeout=budget(self.acquire_timeout, "db.acquire"))
         try:
             logger.debug("QUERY: %s | params=%s", sql, params)
+            with span("db.execute", statement=_sql_name(sql)), self._call_timeout(conn):
+                # with conn.cursor() as cur:
+                #     cur.execute(_sql_text(sql), params or [])
+                #     cols = [d[0] for d in cur.description]
+                #     return [dict(zip(cols, row)) for row in cur.fetchall()]
+                return []  # placeholder return
+        finally:
+            self._release(conn)
+
+    def iter_query(
+        self, sql: SQL, params: Optional[Iterable[Any]] = None, batch_size: int = 10000
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Execute a SELECT and yield rows as dicts, `batch_size` rows per round trip.
+        For full scans that should not be materialized in memory.
+        """
+        with span("db.acquire"):
+            conn = self._acquire(timeout=budget(self.acquire_timeout, "db.acquire"))
+        try:
+            logger.debug("ITER_QUERY: %s | params=%s", sql, params)
             # with conn.cursor() as cur:
-            #     cur.execute(sql, params or [])
+            #     cur.arraysize = batch_size
+            #     cur.execute(_sql_text(sql), params or [])
             #     cols = [d[0] for d in cur.description]
-            #     return [dict(zip(cols, row)) for row in cur.fetchall()]
-            return []  # placeholder return
+            #     while rows := cur.fetchmany(batch_size):
+            #         for row in rows:
+            #             yield dict(zip(cols, row))
+            yield from ()  # placeholder: no rows
         finally:
             self._release(conn)
 
-    def non_query(self, sql: str, params: Optional[Iterable[Any]] = None) -> int:
+    def non_query(self, sql: SQL, params: Optional[Iterable[Any]] = None) -> int:
         """
         Execute INSERT/UPDATE/DELETE; return affected row count.
         """
-        conn = self._acquire()
+        with span("db.acquire"):
+            conn = self._acquire(timeout=budget(self.acquire_timeout, "db.acquire"))
         try:
             logger.debug("NON_QUERY: %s | params=%s", sql, params)
-            # with conn.cursor() as cur:
-            #     cur.execute(sql, params or [])
-            #     conn.commit()
-            #     return cur.rowcount or 0
-            return 1  # placeholder affected rows
+            with span("db.execute", statement=_sql_name(sql)), self._call_timeout(conn):
+                # with conn.cursor() as cur:
+                #     cur.execute(_sql_text(sql), params or [])
+                #     conn.commit()
+                #     return cur.rowcount or 0
+                return 1  # placeholder affected rows
         finally:
             self._release(conn)
+
+    def warm_up(self, statements: Iterable[Statement]) -> dict[str, Any]:
+        """
+        Open `pool_min` connections (all held at once, so the pool has to create them)
+        and prepare every statement on each, so the first requests after a deploy
+        skip connection setup and parsing. A statement that fails to prepare is
+        logged and counted in `failed`; it is parsed on first use instead.
+        """
+        statements = list(statements)
+        if len(statements) > self.stmt_cache_size:
+            logger.warning(
+                "stmt_cache_size=%d is below the %d registered statements; some will be re-parsed",
+                self.stmt_cache_size,
+                len(statements),
+            )
+        t0 = time.perf_counter()
+        conns = []
+        failed = 0
+        try:
+            for _ in range(self.pool_min):
+                conns.append(self._acquire(timeout=self.acquire_timeout))
+            for conn in conns:
+                for statement in statements:
+                    try:
+                        self._prepare(conn, statement)
+                    except Exception:
+                        failed += 1
+                        logger.warning("DB warm-up: could not prepare %s", statement.name, exc_info=True)
+        finally:
+            for conn in conns:
+                self._release(conn)
+        report = {
+            "connections": len(conns),
+            "statements": len(statements),
+            "failed": failed,
+            "seconds": round(time.perf_counter() - t0, 4),
+        }
+        logger.info("DB warm-up done: %s", report)
+        return report
@@ -4,47 +4,229 @@ Prefer parameterized SQL over string interpolation to avoid injection.
 """
 
 from __future__ import annotations
-from typing import Any, Iterable, Optional
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
 from .conn_factory import WrapMakeConnection
+from .statements import STATEMENTS
+from src.main.utils.pagination import decode_cursor, encode_cursor
+from src.main.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+_MISSING = object()
+
+# Keyset for finddb1 pages: newest first, ID breaks ties. Needs an index on
+# (columnname, column2name, id) so every page is an index range seek.
+# Oracle returns upper-case column names.
+FINDDB1_SEEK_KEYS = ("COLUMN2NAME", "ID")
+MAX_PAGE_SIZE = 1000
+
+# -------------------------
+# Statements (normalized once; prepared on every pooled connection at startup)
+# -------------------------
+INSERTDB = STATEMENTS.register(
+    "insertdb",
+    """
+    INSERT INTO DBNAME (column1name, column2name)
+    VALUES (:1, TO_DATE(:2, 'YYYY-MM-DD HH24:MI:SS'))
+    """,
+    kind="non_query",
+)
+FINDDB1 = STATEMENTS.register(
+    "finddb1",
+    """
+    SELECT *
+    FROM DBNAME
+    WHERE columnname = :1
+    """,
+)
+FINDDB1_PAGE_FIRST = STATEMENTS.register(
+    "finddb1_page_first",
+    """
+    SELECT *
+    FROM DBNAME
+    WHERE columnname = :1
+    ORDER BY column2name DESC, id DESC
+    FETCH FIRST :2 ROWS ONLY
+    """,
+)
+# Rows strictly after the last key (dt, id) in (column2name DESC, id DESC) order:
+# column2name < dt, or column2name = dt with id < last id. `column2name <= :2`
+# is required, not redundant: without it `id < :4` would also let in newer rows.
+# It also bounds the index range scan.
+FINDDB1_PAGE_SEEK = STATEMENTS.register(
+    "finddb1_page_seek",
+    """
+    SELECT *
+    FROM DBNAME
+    WHERE columnname = :1
+      AND column2name <= :2
+      AND (column2name < :3 OR id < :4)
+    ORDER BY column2name DESC, id DESC
+    FETCH FIRST :5 ROWS ONLY
+    """,
+)
+# Cheap fingerprint of finddb1's rows for `value` (ETag version token): served from
+# the (columnname, column2name, id) index alone. Sees inserts and deletes from any
+# writer; in-place updates of other columns don't move it.
+FINDDB1_VERSION = STATEMENTS.register(
+    "finddb1_version",
+    """
+    SELECT COUNT(*) AS row_count, MAX(column2name) AS last_changed, MAX(id) AS last_id
+    FROM DBNAME
+    WHERE columnname = :1
+    """,
+)
+FINDDB2 = STATEMENTS.register(
+    "finddb2",
+    """
+    SELECT 1
+    FROM DBNAME
+    WHERE columnname = :1
+    FETCH FIRST 1 ROWS ONLY
+    """,
+)
+DISTINCT_KEYS = STATEMENTS.register(
+    "distinct_keys",
+    """
+    SELECT DISTINCT columnname
+    FROM DBNAME
+    """,
+)
 
 
 class DB_Interface(WrapMakeConnection):
-    def __init__(self, dsn: str, user: str, password: str, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        dsn: str,
+        user: str,
+        password: str,
+        cache: Optional[Any] = None,
+        cache_ttl: Optional[float] = None,
+        existence_index: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        `cache`: optional read-through backend for finddb* (LocalCache, SharedMemoryCache,
+        or anything with get(key, default) / set(key, value, ttl) / delete(key)).
+        `existence_index`: optional BloomFilter over columnname; finddb2 answers
+        definite misses from it without a DB round trip.
+        """
         super().__init__(dsn=dsn, user=user, password=password, **kwargs)
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.existence_index = existence_index
 
+    def _read_through(self, key: str, loader: Callable[[], T]) -> T:
+        """
+        Return the cached value for `key`, or load it and populate the cache.
+        """
+        if self.cache is None:
+            return loader()
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = loader()
+        try:
+            self.cache.set(key, value, ttl=self.cache_ttl)
+        except ValueError as e:  # too large for the backend; serve uncached
+            logger.debug("Not caching %s: %s", key, e)
+        return value
+
+    def _invalidate(self, value: str) -> None:
+        if self.cache is not None:
+            self.cache.delete(f"finddb1:{value}")
+            self.cache.delete(f"finddb2:{value}")
+
+    @traced("db.version_token")
+    def version_token(self, value: str) -> Optional[str]:
+        """
+        Token that changes whenever the rows for `value` do, derived from the database
+        (row count and newest key), so it is the same in every worker and sees writes
+        made outside this interface. Never cached: one index-only query per call.
+        """
+        rows = self.conn.query(FINDDB1_VERSION, (value,))
+        if not rows:
+            return None
+        state = json.dumps(list(rows[0].values()), default=str, separators=(",", ":"))
+        return hashlib.blake2b(state.encode("utf-8"), digest_size=8).hexdigest()
+
+    @traced("db.insertdb")
     def insertdb(self, value1: str, dt_str: str) -> int:
         """
         Example INSERT. Use parameter placeholders compatible with your driver.
         For cx_Oracle/oracledb it's usually named binds like :1, :2, etc.
         """
-        sql = """
-            INSERT INTO DBNAME (column1name, column2name)
-            VALUES (:1, TO_DATE(:2, 'YYYY-MM-DD HH24:MI:SS'))
-        """.strip()
         params: Iterable[Optional[str]] = (value1, dt_str)
-        return self.conn.non_query(sql, params)
+        affected = self.conn.non_query(INSERTDB, params)
+        self._invalidate(value1)
+        if self.existence_index is not None:
+            self.existence_index.add(value1)
+        return affected
+
+    def warm_up(self) -> dict[str, Any]:
+        """
+        Open the pool's minimum connections and prepare every registered statement on them.
+        """
+        return self.conn.warm_up(STATEMENTS)
 
+    def iter_keys(self) -> Iterator[str]:
+        """
+        Stream every distinct columnname (bulk load for the existence index).
+        """
+        for row in self.conn.iter_query(DISTINCT_KEYS):
+            yield str(next(iter(row.values())))
+
+    @traced("db.finddb1")
     def finddb1(self, value: str) -> list[dict[str, Any]]:
         """
         Example SELECT returning a list of rows.
         """
-        sql = """
-            SELECT *
-            FROM DBNAME
-            WHERE columnname = :1
-        """.strip()
         params: Iterable[Optional[str]] = (value,)
-        return self.conn.query(sql, params)
+        return self._read_through(f"finddb1:{value}", lambda: self.conn.query(FINDDB1, params))
+
+    @traced("db.finddb1_page")
+    def finddb1_page(
+        self, value: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """
+        Keyset-paginated finddb1: return (rows, next_cursor).
+        Each page seeks past the previous page's last key instead of using OFFSET,
+        so page N costs the same as page 1. `next_cursor` is None on the last page.
+        Pages are not read through the cache (keys depend on cursor position).
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        scope = f"finddb1:{value}"
+        if cursor is None:
+            statement = FINDDB1_PAGE_FIRST
+            params: Iterable[Any] = (value, limit + 1)
+        else:
+            last = decode_cursor(cursor, scope)
+            statement = FINDDB1_PAGE_SEEK
+            seek_dt, seek_id = (last[k] for k in FINDDB1_SEEK_KEYS)
+            params = (value, seek_dt, seek_dt, seek_id, limit + 1)
+
+        # One extra row tells us whether another page exists without a COUNT(*)
+        rows = self.conn.query(statement, params)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        next_cursor = encode_cursor({k: rows[-1][k] for k in FINDDB1_SEEK_KEYS}, scope)
+        return rows, next_cursor
 
+    @traced("db.finddb2")
     def finddb2(self, value: str) -> bool:
         """
         Return True/False based on existence or a condition.
+        With an existence index, keys it has never seen return False without a query.
         """
-        sql = """
-            SELECT 1
-            FROM DBNAME
-            WHERE columnname = :1
-            FETCH FIRST 1 ROWS ONLY
-        """.strip()
-        rows = self.conn.query(sql, (value,))
-        return len(rows) > 0
+        index = self.existence_index
+        if index is not None and not index.might_contain(value):
+            return False
+        found = self._read_through(f"finddb2:{value}", lambda: len(self.conn.query(FINDDB2, (value,))) > 0)
+        if index is not None and not found and index.ready:
+            index.record_false_positive()
+        return found
@@ -0,0 +1,64 @@
+"""
+Named, precompiled SQL statements.
+
+Statement text is normalized once at import (dedented, stripped) and reused
+verbatim on every call. With an identical string each time, the driver's
+per-connection statement cache (oracledb `stmtcachesize`) finds the parsed
+cursor instead of sending the text to be parsed again. The registry also tells
+the startup warm-up which statements to prepare on each pooled connection.
+
+Usage:
+    FIND_X = STATEMENTS.register("find_x", "SELECT * FROM T WHERE c = :1")
+    rows = conn.query(FIND_X, (value,))
+"""
+
+from __future__ import annotations
+
+import textwrap
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass(frozen=True)
+class Statement:
+    name: str
+    sql: str
+    kind: str = "query"  # query | non_query
+
+    def __str__(self) -> str:
+        return self.sql
+
+
+class StatementRegistry:
+    """
+    Name -> Statement map; names are unique so every call site shares one string.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[str, Statement] = {}
+
+    def register(self, name: str, sql: str, kind: str = "query") -> Statement:
+        if kind not in ("query", "non_query"):
+            raise ValueError(f"Unknown statement kind: {kind}")
+        statement = Statement(name=name, sql=textwrap.dedent(sql).strip(), kind=kind)
+        existing = self._statements.get(name)
+        if existing is not None and existing != statement:
+            raise ValueError(f"Statement {name!r} is already registered with different SQL")
+        self._statements[name] = statement
+        return statement
+
+    def __getitem__(self, name: str) -> Statement:
+        return self._statements[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._statements
+
+    def __iter__(self) -> Iterator[Statement]:
+        return iter(list(self._statements.values()))
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+# Shared registry for DB_Interface statements
+STATEMENTS = StatementRegistry()
@@ -0,0 +1,6 @@
+"""
+Initialize the CPU-bound offload facility for the services layer.
+"""
+from .cpu_pool import CpuPool, cpu_bound, cpu_pool
+
+__all__ = ["CpuPool", "cpu_bound", "cpu_pool"]
@@ -0,0 +1,318 @@
+"""
+Process-pool offload for CPU-bound service functions.
+
+CPU-heavy work run inline holds the GIL and stalls every other request in the
+worker (including /healthy). Mark such functions with @cpu_bound; once the
+shared pool is started they run in a ProcessPoolExecutor, otherwise inline.
+
+Usage:
+    @cpu_bound
+    def crunch(data: list[int]) -> int: ...
+
+    crunch(data)              # sync routes: blocks this thread, not the GIL
+    await crunch.aio(data)    # async routes
+    cpu_pool.metrics()        # queue depth / counters
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import update_wrapper
+from typing import Any, Callable, Optional, TypeVar, cast
+
+from starlette.concurrency import run_in_threadpool
+
+from src.main.utils.deadline import budget, check_deadline
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_CPU_BOUND_ATTR = "__cpu_bound__"
+
+
+# -------------------------
+# Worker-side helpers
+# -------------------------
+def _resolve(module_name: str, qualname: str) -> Callable[..., Any]:
+    """
+    Look up a function by import path and strip the @cpu_bound wrapper, so the
+    worker runs the original body instead of trying to offload again.
+    """
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    if getattr(target, _CPU_BOUND_ATTR, False):
+        target = target.__wrapped__
+    return target
+
+
+def _invoke(payload: bytes) -> Any:
+    module_name, qualname, args, kwargs = pickle.loads(payload)
+    return _resolve(module_name, qualname)(*args, **kwargs)
+
+
+def _warm_up(delay: float) -> int:
+    # Keep each worker busy briefly so the executor spawns all of them
+    time.sleep(delay)
+    return os.getpid()
+
+
+# -------------------------
+# Pool
+# -------------------------
+class CpuPool:
+    """
+    Thin wrapper over ProcessPoolExecutor with pre-warming, payload size
+    checks, per-call timeouts and queue-depth counters.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        start_method: str = "spawn",
+        prewarm: bool = True,
+        timeout_seconds: float = 10.0,
+        max_payload_bytes: int = 1024 * 1024,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self.prewarm = prewarm
+        self.timeout_seconds = timeout_seconds
+        self.max_payload_bytes = max_payload_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "inline": 0,
+            "payload_bytes": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """
+        Create the executor; with `prewarm`, block until every worker is up.
+        """
+        if self._executor is not None:
+            return
+        ctx = multiprocessing.get_context(self.start_method)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+        if self.prewarm:
+            t0 = time.perf_counter()
+            futures = [self._executor.submit(_warm_up, 0.05) for _ in range(self.max_workers)]
+            pids = {f.result() for f in futures}
+            logger.info(
+                "CPU pool warmed: %d worker(s) in %.0f ms",
+                len(pids),
+                (time.perf_counter() - t0) * 1000,
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+
+    # --- submission ---
+
+    def _pack(self, func: Callable[..., Any], args: tuple, kwargs: dict) -> bytes:
+        """
+        Pickle the call once, up front, so its size is known before it is queued.
+        Oversized payloads are rejected: copying them to a worker would cost more
+        than the work saves.
+        """
+        payload = pickle.dumps(
+            (func.__module__, func.__qualname__, args, kwargs),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        if self.max_payload_bytes and len(payload) > self.max_payload_bytes:
+            raise ValueError(
+                f"{func.__qualname__}: pickled arguments are {len(payload)} bytes "
+                f"(limit {self.max_payload_bytes}); pass a reference (id/path) instead"
+            )
+        return payload
+
+    def _on_done(self, fut: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if fut.cancelled() or fut.exception() is not None:
+                self._counters["failed"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    def submit_future(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if self._executor is None:
+            raise RuntimeError("CPU pool is not started")
+        payload = self._pack(func, args, kwargs)
+        with self._lock:
+            self._pending += 1
+            self._counters["submitted"] += 1
+            self._counters["payload_bytes"] += len(payload)
+        fut = self._executor.submit(_invoke, payload)
+        fut.add_done_callback(self._on_done)
+        return fut
+
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        value = self.timeout_seconds if timeout is None else timeout
+        return budget(value or None, "cpu pool call")  # never wait past the request deadline
+
+    def _count_inline(self) -> None:
+        with self._lock:
+            self._counters["inline"] += 1
+
+    def _count_timeout(self) -> None:
+        with self._lock:
+            self._counters["timeouts"] += 1
+
+    def call(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Run `func` in the pool and wait for the result (inline if the pool is not started).
+        Raises TimeoutError after `timeout` seconds; the worker finishes the call in the background.
+        """
+        if self._executor is None:
+            self._count_inline()
+            return func(*args, **kwargs)
+        wait = self._timeout(timeout)  # before pickling/queueing: a spent budget never reaches the pool
+        fut = self.submit_future(func, *args, **kwargs)
+        try:
+            return fut.result(timeout=wait)
+        except concurrent.futures.TimeoutError:
+            if fut.done():
+                raise  # raised by func itself (TimeoutError subclasses share the type), not our wait
+            fut.cancel()
+            self._count_timeout()
+            check_deadline(func.__qualname__)
+            raise TimeoutError(f"{func.__qualname__} timed out in CPU pool") from None
+
+    async def call_async(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Await-able variant of call() for async routes; never blocks the event loop
+        (without the pool, the call runs in the threadpool instead).
+        """
+        if self._executor is None:
+            self._count_inline()
+            return await run_in_threadpool(func, *args, **kwargs)
+        wait = self._timeout(timeout)
+        cf = self.submit_future(func, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(cf), timeout=wait)
+        except asyncio.TimeoutError:
+            if cf.done() and not cf.cancelled():
+                raise  # raised by func itself, not our wait
+            cf.cancel()  # drop it if still queued; a running call finishes in the background
+            self._count_timeout()
+            check_deadline(func.__qualname__)
+            raise TimeoutError(f"{func.__qualname__} timed out in CPU pool") from None
+
+    # --- observability ---
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Snapshot of pool state. `queue_depth` counts submitted calls not yet finished
+        (queued + running); anything above `workers` is waiting for a free process.
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "workers": self.max_workers,
+                "queue_depth": self._pending,
+                **self._counters,
+            }
+
+
+def _pool_from_settings() -> CpuPool:
+    try:
+        from src.main.config import get_settings
+
+        cfg = get_settings().executor
+        return CpuPool(
+            max_workers=cfg.cpu_pool_workers,
+            start_method=cfg.cpu_pool_start_method,
+            prewarm=cfg.cpu_pool_prewarm,
+            timeout_seconds=cfg.cpu_pool_timeout_seconds,
+            max_payload_bytes=cfg.cpu_pool_max_payload_bytes,
+        )
+    except Exception:
+        # Fallback defaults if settings aren't ready at import time
+        return CpuPool()
+
+
+# Shared pool; started/stopped by the app's startup/shutdown hooks
+cpu_pool = _pool_from_settings()
+
+
+class _CpuBoundFunction:
+    """
+    Callable returned by @cpu_bound. A descriptor, like a plain function, so that
+    `obj.method(...)` and `obj.method.aio(...)` both receive `self`.
+    """
+
+    def __init__(self, fn: Callable[..., Any], timeout: Optional[float]) -> None:
+        update_wrapper(self, fn)
+        self._fn = fn
+        self._call_timeout = timeout
+        setattr(self, _CPU_BOUND_ATTR, True)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return cpu_pool.call(self._fn, *args, timeout=self._call_timeout, **kwargs)
+
+    async def aio(self, *args: Any, **kwargs: Any) -> Any:
+        return await cpu_pool.call_async(self._fn, *args, timeout=self._call_timeout, **kwargs)
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return _BoundCpuBoundMethod(self, obj)
+
+
+class _BoundCpuBoundMethod:
+    __slots__ = ("__func__", "__self__")
+
+    def __init__(self, func: _CpuBoundFunction, obj: Any) -> None:
+        self.__func__ = func
+        self.__self__ = obj
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.__func__(self.__self__, *args, **kwargs)
+
+    async def aio(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.__func__.aio(self.__self__, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__func__, name)
+
+
+def cpu_bound(func: Optional[F] = None, *, timeout: Optional[float] = None) -> Any:
+    """
+    Declare a service function (or method) as CPU-bound.
+    Must be defined at module/class level so worker processes can import it.
+
+        @cpu_bound
+        def f(...): ...
+
+        @cpu_bound(timeout=2.0)
+        def g(...): ...
+
+    Methods work too: `obj.method(...)` / `await obj.method.aio(...)`.
+    """
+
+    def decorate(fn: F) -> F:
+        return cast(F, _CpuBoundFunction(fn, timeout))
+
+    return decorate(func) if func is not None else decorate
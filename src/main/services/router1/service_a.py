@@ -7,6 +7,9 @@ from __future__ import annotations
 import logging
 from typing import Any, Optional
 
+from src.main.services.executor import cpu_bound
+from src.main.utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,9 +18,12 @@ class ServiceA:
         self.param1 = param1
         self.param2 = param2
 
+    @cpu_bound
     def function1(self) -> dict[str, Any]:
         """
         Example operation. Replace with your business logic.
+        Marked @cpu_bound: runs in the process pool when it is enabled, so keep
+        `self` and the return value picklable.
         """
         logger.info("ServiceA.function1 called")
         try:
@@ -44,6 +50,7 @@ class ServiceA:
 
 
 # Convenience function so routers can call `service_a(username)` directly.
+@traced("service_a")
 def service_a(param1: str, param2: Optional[str] = None) -> dict[str, Any]:
     svc = ServiceA(param1=param1, param2=param2)
     return svc.function1()
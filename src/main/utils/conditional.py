@@ -0,0 +1,146 @@
+"""
+ETag / If-None-Match support for cacheable GET endpoints (opt-in per route).
+
+Two ways to get a strong ETag:
+- version token: `version(**endpoint_kwargs)` returns a cheap token that changes
+  whenever the underlying data does (e.g., db api `finddb1_version`). The ETag is
+  derived from it *before* the endpoint runs, so a matching If-None-Match is
+  answered with 304 without running the endpoint's query or serializing anything.
+- body hash: without a token, the endpoint runs and the ETag is a hash of the
+  serialized body; a match still turns into a bodiless 304.
+
+Usage:
+    @router.get("/x", ...)
+    @handle_except
+    @conditional_get(cache_control="private, max-age=30", version=lambda value, **_: finddb1_version(value))
+    def endpoint(self, value: str): ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+from functools import wraps
+from typing import Any, Callable, Optional, TypeVar, cast
+
+from fastapi import Request, status
+from fastapi.responses import Response
+
+from src.main.schemas import resolve_version
+from src.main.utils.negotiation import MSGPACK_AVAILABLE, response_media_type
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_REQUEST_PARAM = "_conditional_request"
+
+
+def _strong_etag(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison: W/ prefixes are ignored, `*` matches anything.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _validator_headers(etag: str, cache_control: Optional[str]) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if MSGPACK_AVAILABLE:
+        headers["Vary"] = "Accept"
+    return headers
+
+
+def _not_modified(etag: str, cache_control: Optional[str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_validator_headers(etag, cache_control))
+
+
+def _token_etag(request: Request, token: str, app_version: str) -> str:
+    # Same token, different query/representation -> different ETag. Tokens can outlive
+    # a deploy (shm cache), so the app version is mixed in: a release whose body or
+    # envelope `version` differs must not be answered with 304.
+    return _strong_etag(
+        token.encode("utf-8"),
+        app_version.encode("utf-8"),
+        request.url.path.encode("utf-8"),
+        request.url.query.encode("utf-8"),
+        response_media_type().encode("ascii"),
+    )
+
+
+def conditional_get(
+    cache_control: Optional[str] = None,
+    version: Optional[Callable[..., Optional[str]]] = None,
+) -> Callable[[F], F]:
+    """
+    Decorate a GET endpoint (sync or async) that returns handle_resp(...).
+    `version` receives the endpoint's keyword arguments and returns a token or None.
+    """
+
+    def decorate(func: F) -> F:
+        sig = inspect.signature(func)
+        params = [p for p in sig.parameters.values() if p.kind is not inspect.Parameter.VAR_KEYWORD]
+        var_kw = [p for p in sig.parameters.values() if p.kind is inspect.Parameter.VAR_KEYWORD]
+        request_param = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        app_version = resolve_version()
+
+        def before(request: Request, kwargs: dict[str, Any]) -> tuple[Optional[str], Optional[Response]]:
+            if version is None or request.method not in ("GET", "HEAD"):
+                return None, None
+            token = version(**kwargs)
+            if not token:
+                return None, None
+            etag = _token_etag(request, token, app_version)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return etag, _not_modified(etag, cache_control)
+            return etag, None
+
+        def after(request: Request, response: Any, etag: Optional[str]) -> Any:
+            if not isinstance(response, Response) or response.status_code != status.HTTP_200_OK:
+                return response
+            if etag is None:
+                etag = _strong_etag(bytes(response.body))
+                if etag_matches(request.headers.get("if-none-match"), etag):
+                    return _not_modified(etag, cache_control)
+            response.headers.update(_validator_headers(etag, cache_control))
+            return response
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                request: Request = kwargs.pop(_REQUEST_PARAM)
+                etag, short_circuit = before(request, kwargs)
+                if short_circuit is not None:
+                    return short_circuit
+                return after(request, await func(*args, **kwargs), etag)
+
+            wrapper: Any = async_wrapper
+        else:
+            @wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                request: Request = kwargs.pop(_REQUEST_PARAM)
+                etag, short_circuit = before(request, kwargs)
+                if short_circuit is not None:
+                    return short_circuit
+                return after(request, func(*args, **kwargs), etag)
+
+            wrapper = sync_wrapper
+
+        # Let FastAPI inject the Request alongside the endpoint's own parameters
+        wrapper.__signature__ = sig.replace(parameters=[*params, request_param, *var_kw])
+        return cast(F, wrapper)
+
+    return decorate
@@ -0,0 +1,348 @@
+"""
+Request deadlines, propagated from the edge down to DB calls.
+
+- DeadlineMiddleware starts the clock when a request arrives. The deadline comes
+  from a client header (e.g. `X-Request-Timeout: 2`, seconds) or the configured
+  default, and lives in a contextvar (copied into threadpool-run sync routes).
+  The middleware answers 504 once it is spent, and cancels the request's work
+  when the client disconnects.
+- @with_deadline(seconds) sets a per-route budget for requests without the header;
+  it takes precedence over the configured default. The middleware re-arms its
+  timer when a route changes the deadline.
+- budget(cap) / check_deadline() are what lower layers call: MakeConnection turns
+  the remaining budget into pool-acquire and driver call timeouts, and stops
+  before starting work that can no longer finish in time.
+
+Every expiry surfaces as DeadlineExceededError, rendered as 504 with
+status_code "2" in the InternalServerErrorModel envelope.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Optional, TypeVar, cast
+
+from fastapi import status
+from fastapi.responses import Response
+
+from src.main.schemas import InternalServerErrorModel, ResultStatusEm
+from src.main.utils.resp_util import handle_resp
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request's time budget is spent (or the client went away)."""
+
+
+class Deadline:
+    """
+    Mutable per-request deadline; the same object is shared by every context copy
+    of the request, so cancel() is seen by work already running in threads.
+    """
+
+    __slots__ = ("started_at", "expires_at", "explicit", "cancelled", "on_change")
+
+    def __init__(self, started_at: float, expires_at: Optional[float], explicit: bool = False) -> None:
+        self.started_at = started_at
+        self.expires_at = expires_at
+        self.explicit = explicit  # set by the client header; route defaults don't override it
+        self.cancelled: Optional[str] = None
+        self.on_change: Optional[Callable[[], None]] = None  # set by DeadlineMiddleware; any thread
+
+    def reset(self, expires_at: Optional[float]) -> None:
+        """
+        Move the deadline and tell whoever is enforcing it.
+        """
+        self.expires_at = expires_at
+        if self.on_change is not None:
+            self.on_change()
+
+    def remaining(self) -> Optional[float]:
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def cancel(self, reason: str) -> None:
+        self.cancelled = self.cancelled or reason
+
+
+_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+# -------------------------
+# Budget helpers
+# -------------------------
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left for the current request (None = no deadline).
+    """
+    dl = _deadline.get()
+    return None if dl is None else dl.remaining()
+
+
+def deadline_exceeded() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline(stage: str = "") -> None:
+    """
+    Raise DeadlineExceededError if the current request's budget is spent.
+    """
+    dl = _deadline.get()
+    if dl is None:
+        return
+    left = dl.remaining()
+    if left is not None and left <= 0:
+        reason = dl.cancelled or "deadline exceeded"
+        where = f" before {stage}" if stage else ""
+        elapsed_ms = (time.monotonic() - dl.started_at) * 1000
+        raise DeadlineExceededError(f"Request {reason}{where} ({elapsed_ms:.0f} ms elapsed)")
+
+
+def budget(cap: Optional[float] = None, stage: str = "") -> Optional[float]:
+    """
+    Timeout to use for the next blocking call: the remaining budget, capped by `cap`
+    (the call's own default). None means wait indefinitely. Raises if already spent.
+    """
+    check_deadline(stage)
+    left = remaining()
+    if left is None:
+        return cap
+    return left if cap is None else min(left, cap)
+
+
+def timeout_response(msg: str) -> Response:
+    model = InternalServerErrorModel(status_code=ResultStatusEm.timeout, msg=msg)
+    return handle_resp(model, status.HTTP_504_GATEWAY_TIMEOUT)
+
+
+# -------------------------
+# Per-route default
+# -------------------------
+def with_deadline(seconds: float) -> Callable[[F], F]:
+    """
+    Per-route budget, counted from request arrival, for requests that did not send
+    a timeout header (it replaces `[Deadlines] default_seconds`). Async routes are
+    also cancelled when it runs out; for sync routes the middleware answers 504.
+    """
+
+    def apply() -> Deadline:
+        dl = _deadline.get()
+        if dl is None:  # called outside DeadlineMiddleware
+            now = time.monotonic()
+            dl = Deadline(now, now + seconds)
+            _deadline.set(dl)
+        elif not dl.explicit:
+            dl.reset(dl.started_at + seconds)
+        return dl
+
+    def decorate(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                dl = apply()
+                check_deadline(func.__name__)
+                try:
+                    return await asyncio.wait_for(func(*args, **kwargs), timeout=dl.remaining())
+                except asyncio.TimeoutError:
+                    if not deadline_exceeded():
+                        raise  # the route's own timeout, not ours
+                    check_deadline()
+                    raise
+
+            return cast(F, async_wrapper)
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            apply()
+            check_deadline(func.__name__)
+            return func(*args, **kwargs)
+
+        return cast(F, sync_wrapper)
+
+    return decorate
+
+
+# -------------------------
+# Middleware
+# -------------------------
+def parse_timeout(value: Optional[str]) -> Optional[float]:
+    """
+    Timeout header value in seconds ("2", "0.5"); None if missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+class DeadlineMiddleware:
+    """
+    Pure ASGI middleware: set the request deadline, answer 504 when it is spent
+    before a response started, and cancel the app when the client disconnects.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        header: str = "X-Request-Timeout",
+        default_seconds: float = 0.0,
+        max_seconds: float = 0.0,
+        cancel_on_disconnect: bool = True,
+    ) -> None:
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.default_seconds = default_seconds
+        self.max_seconds = max_seconds
+        self.cancel_on_disconnect = cancel_on_disconnect
+
+    def _deadline(self, scope: dict[str, Any]) -> Deadline:
+        now = time.monotonic()
+        requested = None
+        for name, value in scope.get("headers", ()):
+            if name == self.header:
+                requested = parse_timeout(value.decode("latin-1"))
+                break
+        seconds = requested or self.default_seconds or None
+        if seconds and self.max_seconds:
+            seconds = min(seconds, self.max_seconds)
+        return Deadline(now, now + seconds if seconds else None, explicit=requested is not None)
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        dl = self._deadline(scope)
+        token = _deadline.set(dl)
+        try:
+            # Supervised even without a deadline yet: a route may set one with @with_deadline
+            await self._supervise(scope, receive, send, dl)
+        finally:
+            _deadline.reset(token)
+
+    async def _supervise(self, scope: dict[str, Any], receive: Any, send: Any, dl: Deadline) -> None:
+        response_started = response_complete = abandoned = False
+        disconnected = asyncio.Event()
+        watcher: Optional[asyncio.Task] = None
+        has_body = any(
+            (name == b"content-length" and value.strip() not in (b"", b"0")) or name == b"transfer-encoding"
+            for name, value in scope.get("headers", ())
+        )
+        body_done = not has_body
+        empty_body_sent = False
+
+        async def watch_disconnect() -> None:
+            # Only runs once the app has the whole body, so it never competes for it
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        def start_watcher() -> None:
+            nonlocal watcher
+            if self.cancel_on_disconnect and watcher is None:
+                watcher = asyncio.create_task(watch_disconnect())
+
+        async def app_receive() -> dict[str, Any]:
+            nonlocal body_done, empty_body_sent
+            if not body_done:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                elif not message.get("more_body", False):
+                    body_done = True
+                    start_watcher()
+                return message
+            if not has_body and not empty_body_sent:
+                empty_body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def app_send(message: dict[str, Any]) -> None:
+            nonlocal response_started, response_complete
+            if abandoned:
+                return  # we already answered (or nobody is listening)
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        # The route may move the deadline (from a threadpool thread for sync routes)
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        dl.on_change = lambda: loop.call_soon_threadsafe(changed.set)
+
+        if body_done:
+            start_watcher()
+        app_task = asyncio.create_task(self.app(scope, app_receive, app_send))
+        gone = asyncio.create_task(disconnected.wait())
+        rearm = asyncio.create_task(changed.wait())
+        try:
+            while True:
+                left = None if response_started else dl.remaining()
+                done, _ = await asyncio.wait(
+                    {app_task, gone, rearm}, timeout=None if left is None else max(left, 0.0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if rearm in done and app_task not in done and gone not in done:
+                    changed.clear()
+                    rearm = asyncio.create_task(changed.wait())
+                    continue
+                if app_task in done:
+                    app_task.result()
+                    return
+                if gone in done and response_complete:
+                    # Servers report a disconnect once the response is sent; let background tasks finish
+                    await app_task
+                    return
+                if gone in done:
+                    abandoned = True
+                    dl.cancel("client disconnected")
+                    logger.info("Client disconnected; cancelling %s %s", scope.get("method"), scope.get("path"))
+                    await self._cancel(app_task)
+                    return
+                if not response_started and deadline_exceeded():
+                    elapsed_ms = (time.monotonic() - dl.started_at) * 1000
+                    msg = f"Request deadline exceeded ({elapsed_ms:.0f} ms elapsed)"
+                    logger.warning("%s: %s %s", msg, scope.get("method"), scope.get("path"))
+                    abandoned = True
+                    dl.cancel("deadline exceeded")
+                    await self._cancel(app_task)
+                    await timeout_response(msg)(scope, receive, send)
+                    return
+        finally:
+            dl.on_change = None
+            for task in (app_task, gone, rearm, watcher):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task) -> None:
+        """
+        Cancel the app; sync routes keep their thread until their next budget check.
+        """
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
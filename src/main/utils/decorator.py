@@ -23,7 +23,10 @@ from fastapi import status
 
 # Adjust the import path to match your layout
 from src.main.schemas import ResultStatusEm, InternalServerErrorModel
+from src.main.utils.deadline import DeadlineExceededError, timeout_response
+from src.main.utils.pagination import InvalidCursorError
 from src.main.utils.resp_util import handle_resp
+from src.main.utils.tracing import handler_span
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,15 @@ def _format_exc(e: Exception) -> str:
     return f'File "{file_name}", line {line_num}, in {func_name}: [{error_class}] {detail}'
 
 
+def _bad_request(e: Exception) -> Any:
+    """
+    Client errors raised below the route (e.g. a tampered cursor): 400 with the
+    error's own message, no server file/line detail.
+    """
+    model = InternalServerErrorModel(status_code=ResultStatusEm.ng, msg=str(e))
+    return handle_resp(model, status.HTTP_400_BAD_REQUEST)
+
+
 def handle_except(func: F) -> F:
     """
     Sync exception wrapper: returns standardized error response on failure.
@@ -53,7 +65,14 @@ def handle_except(func: F) -> F:
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any):
         try:
-            return func(*args, **kwargs)
+            with handler_span(func.__qualname__):
+                return func(*args, **kwargs)
+        except InvalidCursorError as e:
+            logger.info("Rejected cursor in %s: %s", func.__name__, e)
+            return _bad_request(e)
+        except DeadlineExceededError as e:
+            logger.warning("Deadline exceeded in %s: %s", func.__name__, e)
+            return timeout_response(str(e))
         except Exception as e:
             # Log full traceback for observability; return concise message to client.
             logger.exception("Unhandled exception in %s", func.__name__)
@@ -74,7 +93,14 @@ def async_handle_except(func: AF) -> AF:
     @wraps(func)
     async def wrapper(*args: Any, **kwargs: Any):
         try:
-            return await func(*args, **kwargs)
+            with handler_span(func.__qualname__):
+                return await func(*args, **kwargs)
+        except InvalidCursorError as e:
+            logger.info("Rejected cursor in %s: %s", func.__name__, e)
+            return _bad_request(e)
+        except DeadlineExceededError as e:
+            logger.warning("Deadline exceeded in %s: %s", func.__name__, e)
+            return timeout_response(str(e))
         except Exception as e:
             logger.exception("Unhandled exception in %s", func.__name__)
             err_msg = _format_exc(e)
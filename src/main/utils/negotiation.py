@@ -0,0 +1,169 @@
+"""
+Content negotiation: application/msgpack alongside JSON.
+
+- ContentNegotiationMiddleware reads `Accept` once per request and records the
+  preferred response media type in a contextvar; handle_resp() honours it.
+- decode_body() turns a msgpack request body into Python objects for validation.
+- install_msgpack_openapi() advertises the alternate media type in the docs.
+
+msgpack is optional: without it everything stays JSON and msgpack request
+bodies are rejected with 415.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore[assignment]
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = frozenset({MSGPACK_MEDIA_TYPE, "application/x-msgpack"})
+
+MSGPACK_AVAILABLE = msgpack is not None
+
+_response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON_MEDIA_TYPE)
+
+
+class UnsupportedMediaTypeError(Exception):
+    """Raised when a request body uses a media type this service can't decode."""
+
+
+# -------------------------
+# Accept / Content-Type
+# -------------------------
+def _media_type(header_value: str) -> str:
+    return header_value.split(";", 1)[0].strip().lower()
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    return bool(content_type) and _media_type(content_type) in _MSGPACK_ALIASES
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media:
+            ranges.append((media.lower(), q))
+    return ranges
+
+
+def _quality(ranges: list[tuple[str, float]], names: frozenset[str]) -> tuple[float, int]:
+    """
+    (q, specificity) for one of our media types: the most specific matching range
+    sets q (exact 2 > application/* 1 > */* 0); (0, -1) if nothing matches.
+    """
+    best = (0.0, -1)
+    for media, q in ranges:
+        spec = 2 if media in names else 1 if media == "application/*" else 0 if media == "*/*" else -1
+        if spec > best[1]:
+            best = (q, spec)
+    return best
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick JSON or msgpack from an Accept header: highest q wins; on equal q an
+    explicitly named type beats a wildcard match; JSON is the default otherwise
+    (no header, bare wildcards, exact tie).
+    """
+    if not accept or not MSGPACK_AVAILABLE:
+        return JSON_MEDIA_TYPE
+    ranges = _parse_accept(accept)
+    json_q = _quality(ranges, frozenset({JSON_MEDIA_TYPE}))
+    msgpack_q = _quality(ranges, _MSGPACK_ALIASES)
+    if msgpack_q[0] > 0 and msgpack_q > json_q:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def response_media_type() -> str:
+    return _response_media_type.get()
+
+
+class ContentNegotiationMiddleware:
+    """
+    Pure ASGI middleware: store the negotiated response media type for the request.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept":
+                accept = value.decode("latin-1")
+                break
+        token = _response_media_type.set(negotiate(accept))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _response_media_type.reset(token)
+
+
+# -------------------------
+# Encode / decode
+# -------------------------
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def decode_body(body: bytes) -> Any:
+    """
+    Decode a msgpack request body. Callers check is_msgpack() first.
+    Raises UnsupportedMediaTypeError without msgpack, ValueError on malformed input.
+    """
+    if not MSGPACK_AVAILABLE:
+        raise UnsupportedMediaTypeError(f"{MSGPACK_MEDIA_TYPE} is not supported (msgpack not installed)")
+    return msgpack.unpackb(body, raw=False, strict_map_key=True)
+
+
+# -------------------------
+# OpenAPI
+# -------------------------
+def install_msgpack_openapi(app: FastAPI) -> None:
+    """
+    Wrap app.openapi so every documented JSON response also lists
+    application/msgpack with the same schema (422 stays JSON-only: FastAPI's
+    validation errors are not negotiated).
+    """
+    if not MSGPACK_AVAILABLE:
+        return
+    generate = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema:
+            return app.openapi_schema
+        schema = generate()
+        for path_item in schema.get("paths", {}).values():
+            for operation in path_item.values():
+                for code, response in operation.get("responses", {}).items():
+                    content = response.get("content", {})
+                    if code == "422" or JSON_MEDIA_TYPE not in content:
+                        continue
+                    content.setdefault(MSGPACK_MEDIA_TYPE, content[JSON_MEDIA_TYPE])
+        return schema
+
+    app.openapi = openapi  # type: ignore[method-assign]
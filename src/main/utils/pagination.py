@@ -0,0 +1,146 @@
+"""
+Opaque, signed cursor tokens for keyset pagination.
+
+A cursor carries the sort-key values of the last row on a page plus a scope
+(e.g., the queried value), serialized as base64url JSON and signed with
+HMAC-SHA256 so clients can't forge or tamper with seek positions.
+
+Usage:
+    token = encode_cursor({"COLUMN2NAME": dt, "ID": 42}, scope="finddb1:abc")
+    keys = decode_cursor(token, scope="finddb1:abc")
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import stat
+import tempfile
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token is malformed, tampered with, or used out of scope."""
+
+
+_SIG_BYTES = 16
+_HOST_KEY_NAME = "webtemplate-cursor.key"
+
+
+def _host_key(base: Optional[str] = None) -> bytes:
+    """
+    Random key shared by every worker on this host: the first worker to get here
+    publishes it atomically (link() fails if another one already did), the rest
+    read it. Survives worker restarts; not shared across hosts.
+    The directory is world-writable, so the file is only trusted if it is a
+    regular file owned by this user and unreadable by anyone else.
+    """
+    if base is None:
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    path = os.path.join(base, _HOST_KEY_NAME)
+    fd, tmp = tempfile.mkstemp(dir=base, prefix=f".{_HOST_KEY_NAME}.")  # created 0600
+    try:
+        os.write(fd, os.urandom(32))
+        os.close(fd)
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(tmp)
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            raise RuntimeError(
+                f"{path} is not a private cursor key owned by this user; remove it or set SECRET_VARIABLE"
+            )
+        key = os.read(fd, 64)
+    finally:
+        os.close(fd)
+    if len(key) != 32:
+        raise RuntimeError(f"{path} is not a cursor key; remove it or set SECRET_VARIABLE")
+    return key
+
+
+@lru_cache(maxsize=1)
+def _signing_key() -> bytes:
+    """
+    SECRET_VARIABLE from settings. Only the development profile may fall back to
+    a host-wide random key (so cursors issued by one worker are accepted by the
+    others); every other environment must set SECRET_VARIABLE.
+    """
+    try:
+        from src.main.config import get_settings
+
+        settings = get_settings()
+        secret, app_env = settings.secret_variable, settings.app_env
+    except Exception:
+        secret, app_env = os.getenv("SECRET_VARIABLE"), os.getenv("APP_ENV", "development")
+    if secret:
+        return secret.encode("utf-8")
+    if app_env != "development":
+        raise RuntimeError(f"SECRET_VARIABLE must be set to sign pagination cursors (APP_ENV={app_env}).")
+    return _host_key()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _json_default(value: Any) -> Any:
+    # Seek keys are often DATE/TIMESTAMP columns; keep the type across the round trip
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    raise TypeError(f"Cursor value of type {type(value).__name__} is not serializable")
+
+
+def _json_hook(obj: dict[str, Any]) -> Any:
+    if "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    if "$d" in obj:
+        return date.fromisoformat(obj["$d"])
+    return obj
+
+
+def _sign(body: bytes) -> bytes:
+    return hmac.new(_signing_key(), body, hashlib.sha256).digest()[:_SIG_BYTES]
+
+
+def encode_cursor(keys: dict[str, Any], scope: str) -> str:
+    """
+    Build a token for the seek position `keys`, valid only for `scope`.
+    """
+    body = json.dumps({"s": scope, "k": keys}, default=_json_default, separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(body)}.{_b64encode(_sign(body))}"
+
+
+def decode_cursor(token: str, scope: str) -> dict[str, Any]:
+    """
+    Verify `token` and return its seek keys; raise InvalidCursorError otherwise.
+    """
+    try:
+        body_part, sig_part = token.split(".", 1)
+        body, sig = _b64decode(body_part), _b64decode(sig_part)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("malformed cursor") from e
+    if not hmac.compare_digest(sig, _sign(body)):
+        raise InvalidCursorError("cursor signature mismatch")
+    try:
+        payload = json.loads(body, object_hook=_json_hook)
+    except ValueError as e:
+        raise InvalidCursorError("malformed cursor") from e
+    if payload.get("s") != scope:
+        raise InvalidCursorError("cursor does not belong to this query")
+    return payload["k"]
@@ -0,0 +1,185 @@
+"""
+Request helpers for FastAPI.
+
+- BodySizeLimitMiddleware: reject oversized bodies early (413) on Content-Length,
+  and while streaming for chunked/unknown-length bodies.
+- json_body(Model): dependency that validates the raw body bytes directly with a
+  cached TypeAdapter (no json.loads -> dict -> model round trip). Bodies sent as
+  application/msgpack are decoded and validated against the same model.
+
+Usage:
+    @router.post("/x", openapi_extra=json_body_openapi(MyModel))
+    def endpoint(self, request: MyModel = Depends(json_body(MyModel))): ...
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+from src.main.schemas import InternalServerErrorModel, ResultStatusEm
+from src.main.utils.negotiation import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_AVAILABLE,
+    MSGPACK_MEDIA_TYPE,
+    UnsupportedMediaTypeError,
+    decode_body,
+    is_msgpack,
+)
+from src.main.utils.resp_util import handle_resp
+
+
+# -------------------------
+# Body size limit
+# -------------------------
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware: 413 with the standard error envelope once a request body
+    exceeds `max_body_bytes` (0 disables the check).
+    """
+
+    def __init__(self, app: Any, max_body_bytes: int) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def _reject(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        model = InternalServerErrorModel(
+            status_code=ResultStatusEm.ng,
+            msg=f"Request body exceeds {self.max_body_bytes} bytes",
+        )
+        response = handle_resp(model, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        response.headers["Connection"] = "close"
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        limit = self.max_body_bytes
+        if scope["type"] != "http" or not limit:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0  # let the server/app reject malformed headers
+                if declared > limit:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> dict[str, Any]:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: dict[str, Any]) -> None:
+            nonlocal response_started
+            if exceeded:
+                # The app turned _BodyTooLarge into its own error response; replace it
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(scope, receive, send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._reject(scope, receive, send)
+
+
+# -------------------------
+# Fast-path body validation
+# -------------------------
+@lru_cache(maxsize=None)
+def get_adapter(tp: Any) -> TypeAdapter:
+    """
+    Cached TypeAdapter per type; building one compiles a validator, so never do it per request.
+    """
+    return TypeAdapter(tp)
+
+
+def _body_errors(e: ValidationError) -> list[dict[str, Any]]:
+    # Match FastAPI's own error shape: locations are prefixed with "body"
+    return [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+
+
+def _decode_msgpack(body: bytes) -> Any:
+    try:
+        return decode_body(body)
+    except UnsupportedMediaTypeError as e:
+        raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e)) from None
+    except ValueError:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="There was an error parsing the body") from None
+
+
+def json_body(tp: Any) -> Callable[..., Any]:
+    """
+    Dependency factory: validate the raw request bytes as `tp` via validate_json
+    (or decode msgpack, then validate_python). Invalid input raises
+    RequestValidationError (same 422 response as a body param).
+    """
+    adapter = get_adapter(tp)
+
+    async def dependency(request: Request) -> Any:
+        body = await request.body()
+        try:
+            if is_msgpack(request.headers.get("content-type")):
+                return adapter.validate_python(_decode_msgpack(body))
+            return adapter.validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(_body_errors(e), body=body) from None
+
+    return dependency
+
+
+def _inline_defs(schema: Any, defs: dict[str, Any], seen: Optional[frozenset] = None) -> Any:
+    """
+    Replace local "#/$defs/X" refs with their definitions so the schema can sit
+    inline in an OpenAPI operation (recursive models keep their ref).
+    """
+    seen = seen or frozenset()
+    if isinstance(schema, dict):
+        ref = schema.get("$ref", "")
+        if ref.startswith("#/$defs/"):
+            name = ref.rsplit("/", 1)[-1]
+            if name not in seen and name in defs:
+                return _inline_defs(defs[name], defs, seen | {name})
+        return {k: _inline_defs(v, defs, seen) for k, v in schema.items() if k != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_defs(v, defs, seen) for v in schema]
+    return schema
+
+
+def json_body_openapi(tp: Any, required: bool = True) -> dict[str, Any]:
+    """
+    `openapi_extra` for routes using json_body(): documents the request body that
+    FastAPI no longer sees as a parameter.
+    """
+    schema = get_adapter(tp).json_schema()
+    schema = _inline_defs(schema, schema.get("$defs", {}))
+    content = {JSON_MEDIA_TYPE: {"schema": schema}}
+    if MSGPACK_AVAILABLE:
+        content[MSGPACK_MEDIA_TYPE] = {"schema": schema}
+    return {"requestBody": {"required": required, "content": content}}
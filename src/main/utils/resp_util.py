@@ -1,17 +1,33 @@
 """
 Response helpers for FastAPI.
+Responses are JSON unless the request negotiated application/msgpack (see negotiation.py).
 """
 
 from __future__ import annotations
 
 from fastapi import status
 from pydantic import BaseModel
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.encoders import jsonable_encoder
 
+from src.main.utils.negotiation import (
+    MSGPACK_AVAILABLE,
+    MSGPACK_MEDIA_TYPE,
+    MsgPackResponse,
+    response_media_type,
+)
+from src.main.utils.tracing import span
 
-def handle_resp(model: BaseModel, status_code: int = status.HTTP_200_OK) -> JSONResponse:
+# Responses differ by Accept once msgpack is possible; tell caches so
+_VARY_HEADERS = {"Vary": "Accept"} if MSGPACK_AVAILABLE else None
+
+
+def handle_resp(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
     """
-    Serialize a Pydantic model to a JSONResponse with the given status code.
+    Serialize a Pydantic model to a JSONResponse (or MsgPackResponse, if negotiated)
+    with the given status code. Both carry the same envelope.
     """
-    return JSONResponse(content=jsonable_encoder(model), status_code=status_code)
+    with span("serialize"):
+        if response_media_type() == MSGPACK_MEDIA_TYPE:
+            return MsgPackResponse(content=model.model_dump(mode="json"), status_code=status_code, headers=_VARY_HEADERS)
+        return JSONResponse(content=jsonable_encoder(model), status_code=status_code, headers=_VARY_HEADERS)
@@ -7,9 +7,12 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from src.main.utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
+@traced("utils_a.function1")
 def function1(arg: str) -> str:
     """
     Example pure helper that transforms a value.
@@ -20,6 +23,7 @@ def function1(arg: str) -> str:
     return out
 
 
+@traced("utils_a.function2")
 def function2(payload: dict[str, Any]) -> dict[str, Any]:
     """
     Example helper that validates/enriches a dict.
@@ -0,0 +1,430 @@
+"""
+Lightweight in-process request tracing (contextvars-propagated spans).
+
+TracingMiddleware opens a trace per HTTP request; `span()` / `@traced` record
+child spans anywhere below it (handlers, services, DB calls). The context is
+copied into threadpool calls, so spans from sync endpoints nest correctly.
+
+Sampling (config [Tracing] mode):
+- off:  no trace is created; span() returns a shared no-op (well under 1 µs).
+- head: a trace is recorded with probability `sample_rate`, decided up front.
+- tail: every request is recorded; only traces slower than `tail_threshold_ms`
+        (or that failed) are exported.
+
+Recorded traces compete for a bounded buffer of the N slowest, and exported
+ones are appended to a JSON-lines file by a background writer thread.
+
+Usage:
+    with span("db.execute", sql=sql):
+        ...
+
+    @traced("service_a")
+    def service_a(...): ...
+"""
+
+from __future__ import annotations
+
+import heapq
+import inspect
+import itertools
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TypeVar, cast
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+# -------------------------
+# Spans and traces
+# -------------------------
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attrs", "_trace", "_token")
+
+    def __init__(self, name: str, trace: "Trace", parent_id: Optional[int], attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.span_id = trace.next_span_id()
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.start_ns = 0
+        self.end_ns = 0
+        self._trace = trace
+        self._token: Any = None
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._trace.spans.append(self)
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def to_dict(self, origin_ns: int) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "start_ms": round((self.start_ns - origin_ns) / 1e6, 3),
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            **({"attrs": self.attrs} if self.attrs else {}),
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    def __init__(self, trace_id: str, attrs: dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.attrs = attrs
+        self.spans: list[Span] = []
+        self.start_wall = time.time()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+        self.handler_started = False
+        self._ids = itertools.count(1)
+
+    def next_span_id(self) -> int:
+        return next(self._ids)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    @property
+    def failed(self) -> bool:
+        return int(self.attrs.get("status", 200)) >= 500 or any("error" in s.attrs for s in self.spans)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "start": self.start_wall,
+            "duration_ms": round(self.duration_ms, 3),
+            **self.attrs,
+            "spans": [s.to_dict(self.start_ns) for s in sorted(self.spans, key=lambda s: s.start_ns)],
+        }
+
+
+# -------------------------
+# Public helpers
+# -------------------------
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def activate_trace(trace: Trace) -> Iterator[Trace]:
+    """
+    Make `trace` the current trace for the block (tests, benchmarks, background jobs).
+    """
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def set_trace_id(trace_id: Optional[str]) -> None:
+    """
+    Adopt an inbound correlation id for the current trace (no-op if not recording).
+    """
+    trace = _current_trace.get()
+    if trace is not None and trace_id:
+        trace.trace_id = trace_id
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """
+    Context manager for a child span of whatever span is current.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    parent = _current_span.get()
+    return Span(name, trace, parent.span_id if parent is not None else None, attrs)
+
+
+def handler_span(name: str) -> Any:
+    """
+    Span for an endpoint body. The first one in a trace also records a
+    `pre_handler` span covering routing, dependencies and request validation.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    if not trace.handler_started:
+        trace.handler_started = True
+        parent = _current_span.get()
+        pre = Span("pre_handler", trace, parent.span_id if parent is not None else None, {})
+        pre.start_ns = parent.start_ns if parent is not None else trace.start_ns
+        pre.end_ns = time.perf_counter_ns()
+        trace.spans.append(pre)
+    return span(f"handler:{name}")
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator form of span(); works for sync and async functions.
+    """
+
+    def decorate(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_trace.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+# -------------------------
+# Exporter / tracer
+# -------------------------
+class JsonLinesExporter:
+    """
+    Append one JSON object per exported trace to `path`.
+    export() only enqueues: a background thread serializes and writes in batches
+    (one flush per batch), so the event loop never waits on the file. When the
+    queue is full the trace is dropped and counted in `dropped`.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str | Path, max_queue: int = 10000, batch_size: int = 256) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+
+    def _count_dropped(self, n: int) -> None:
+        with self._lock:
+            self.dropped += n
+
+    def _serialize(self, batch: list[Any]) -> list[str]:
+        lines = []
+        for item in batch:
+            try:
+                lines.append(json.dumps(item.to_dict(), default=str, separators=(",", ":")) + "\n")
+            except Exception:
+                logger.exception("Trace export: could not serialize trace; dropped")
+                self._count_dropped(1)
+        return lines
+
+    def _run(self) -> None:
+        fh: Any = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(item is self._STOP for item in batch)
+                lines = self._serialize([item for item in batch if item is not self._STOP])
+                if lines:
+                    # Any failure loses this batch only; the thread keeps draining the queue
+                    try:
+                        if fh is None:
+                            self.path.parent.mkdir(parents=True, exist_ok=True)
+                            fh = self.path.open("a", encoding="utf-8")
+                        fh.writelines(lines)
+                        fh.flush()
+                    except Exception:
+                        logger.exception("Trace export failed (%d trace(s) lost)", len(lines))
+                        self._count_dropped(len(lines))
+                if stop:
+                    return
+        finally:
+            if fh is not None:
+                fh.close()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Write what is queued, then stop the writer thread (waits at most `timeout`).
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Trace export queue still full after %.1fs; not waiting for the writer", timeout)
+            return
+        thread.join(timeout)
+
+
+class Tracer:
+    def __init__(
+        self,
+        mode: str = "off",
+        sample_rate: float = 0.01,
+        tail_threshold_ms: float = 500.0,
+        slowest_size: int = 50,
+        exporter: Optional[JsonLinesExporter] = None,
+    ) -> None:
+        if mode not in ("off", "head", "tail"):
+            raise ValueError(f"tracing mode must be off|head|tail, got {mode!r}")
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.tail_threshold_ms = tail_threshold_ms
+        self.slowest_size = slowest_size
+        self.exporter = exporter
+        self._lock = threading.Lock()
+        self._slowest: list[tuple[float, int, Trace]] = []  # min-heap on duration
+        self._seq = itertools.count()
+
+    def should_record(self) -> bool:
+        if self.mode == "off":
+            return False
+        if self.mode == "head":
+            return random.random() < self.sample_rate
+        return True
+
+    def start(self, **attrs: Any) -> Trace:
+        return Trace(uuid.uuid4().hex, attrs)
+
+    def finish(self, trace: Trace) -> None:
+        trace.end_ns = time.perf_counter_ns()
+        duration = trace.duration_ms
+        with self._lock:
+            item = (duration, next(self._seq), trace)
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, item)
+            elif self._slowest and duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+        keep = self.mode == "head" or duration >= self.tail_threshold_ms or trace.failed
+        if keep and self.exporter is not None:
+            self.exporter.export(trace)  # queued; written by the exporter's thread
+
+    def slowest(self) -> list[dict[str, Any]]:
+        """
+        The N slowest recorded traces, slowest first.
+        """
+        with self._lock:
+            items = sorted(self._slowest, key=lambda item: item[0], reverse=True)
+        return [trace.to_dict() for _, _, trace in items]
+
+    def close(self) -> None:
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+def _tracer_from_settings() -> Tracer:
+    try:
+        from src.main.config import get_settings
+
+        cfg = get_settings().tracing
+        return Tracer(
+            mode=cfg.mode,
+            sample_rate=cfg.sample_rate,
+            tail_threshold_ms=cfg.tail_threshold_ms,
+            slowest_size=cfg.slowest_size,
+            exporter=JsonLinesExporter(cfg.export_path) if cfg.export_path else None,
+        )
+    except Exception:
+        # Fallback: tracing off if settings aren't ready at import time
+        return Tracer()
+
+
+tracer = _tracer_from_settings()
+
+
+# -------------------------
+# ASGI middleware
+# -------------------------
+class TracingMiddleware:
+    """
+    Opens the root `request` span for each sampled HTTP request and closes the
+    trace once the response has been sent.
+    """
+
+    def __init__(self, app: Any, tracer: Tracer = tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not self.tracer.should_record():
+            await self.app(scope, receive, send)
+            return
+
+        trace = self.tracer.start(method=scope["method"], path=scope["path"])
+        trace_token = _current_trace.set(trace)
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                trace.attrs["status"] = message["status"]
+            await send(message)
+
+        try:
+            with span("request"):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(trace_token)
+            self.tracer.finish(trace)
@@ -0,0 +1,101 @@
+"""
+Shared fixtures: an in-memory DBNAME table behind a fake MakeConnection, injected
+into the shared db_api (see README "Testing"), and a TestClient over the app.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional
+
+import pytest
+
+from src.main.services.database.conn_instance import MakeConnection
+from src.main.services.database.statements import Statement
+
+
+class TableConnection(MakeConnection):
+    """
+    Executes the registered DB_Interface statements against a list of rows.
+    Only Statement objects are accepted, so inline SQL fails loudly.
+    """
+
+    def __init__(self, rows: Optional[list[dict[str, Any]]] = None, **kwargs: Any) -> None:
+        super().__init__(dsn="fake", user="fake", password="fake", **kwargs)
+        self.rows: list[dict[str, Any]] = list(rows or [])
+        self.executed: list[str] = []
+
+    def add(self, value: str, dt: datetime) -> dict[str, Any]:
+        row = {"COLUMNNAME": value, "COLUMN2NAME": dt, "ID": len(self.rows) + 1}
+        self.rows.append(row)
+        return row
+
+    def _matching(self, value: str) -> list[dict[str, Any]]:
+        rows = [r for r in self.rows if r["COLUMNNAME"] == value]
+        return sorted(rows, key=lambda r: (r["COLUMN2NAME"], r["ID"]), reverse=True)
+
+    def _run(self, sql: Any, params: Optional[Iterable[Any]]) -> Any:
+        assert isinstance(sql, Statement), f"inline SQL reached the connection: {sql!r}"
+        self.executed.append(sql.name)
+        p = list(params or ())
+        if sql.name == "insertdb":
+            self.add(p[0], datetime.strptime(p[1], "%Y-%m-%d %H:%M:%S"))
+            return 1
+        if sql.name == "finddb1":
+            return self._matching(p[0])
+        if sql.name == "finddb1_page_first":
+            return self._matching(p[0])[: p[1]]
+        if sql.name == "finddb1_page_seek":
+            value, dt_le, dt_lt, id_lt, n = p
+            rows = [
+                r for r in self._matching(value)
+                if r["COLUMN2NAME"] <= dt_le and (r["COLUMN2NAME"] < dt_lt or r["ID"] < id_lt)
+            ]
+            return rows[:n]
+        if sql.name == "finddb1_version":
+            rows = self._matching(p[0])
+            return [{
+                "ROW_COUNT": len(rows),
+                "LAST_CHANGED": rows[0]["COLUMN2NAME"] if rows else None,
+                "LAST_ID": max((r["ID"] for r in rows), default=None),
+            }]
+        if sql.name == "finddb2":
+            return [{"1": 1}] if self._matching(p[0]) else []
+        if sql.name == "distinct_keys":
+            return [{"COLUMNNAME": v} for v in sorted({r["COLUMNNAME"] for r in self.rows})]
+        raise AssertionError(f"unexpected statement {sql.name}")
+
+    def query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
+        return self._run(sql, params)
+
+    def non_query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> int:
+        return self._run(sql, params)
+
+    def iter_query(
+        self, sql: Any, params: Optional[Iterable[Any]] = None, batch_size: int = 10000
+    ) -> Iterator[dict[str, Any]]:
+        yield from self._run(sql, params)
+
+
+@pytest.fixture
+def table(monkeypatch: pytest.MonkeyPatch) -> TableConnection:
+    """
+    Fresh in-memory table behind the shared db_api; read-through cache and existence index off.
+    """
+    from src.main.services.database import db_api
+
+    conn = TableConnection()
+    monkeypatch.setattr(db_api, "conn", conn)
+    monkeypatch.setattr(db_api, "cache", None)
+    monkeypatch.setattr(db_api, "existence_index", None)
+    return conn
+
+
+@pytest.fixture
+def client(table: TableConnection) -> Iterator[Any]:
+    from fastapi.testclient import TestClient
+
+    from src.main.main import create_app
+
+    with TestClient(create_app()) as c:
+        yield c
@@ -0,0 +1,151 @@
+"""
+BloomFilter: no false negatives across build, journal replay during a rebuild,
+and re-attach (new instance / other process); key count does not drift on re-inserts.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.main.services.cache import BloomFilter
+from src.main.services.cache import bloom
+
+ROOT = Path(__file__).resolve().parents[4]
+KEYS = [f"key-{i}" for i in range(2000)]
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "index.bloom"
+
+
+def _missing(index: BloomFilter, keys: list[str]) -> list[str]:
+    return [k for k in keys if not index.might_contain(k)]
+
+
+def test_unbuilt_filter_answers_maybe(path: Path) -> None:
+    index = BloomFilter(path, capacity=100)
+    try:
+        assert not index.ready
+        assert index.might_contain("anything")
+    finally:
+        index.close()
+
+
+def test_no_false_negatives_after_build_and_reattach(path: Path) -> None:
+    index = BloomFilter(path, capacity=len(KEYS), fp_rate=0.01)
+    try:
+        assert index.rebuild(iter(KEYS))
+        assert index.ready and _missing(index, KEYS) == []
+        absent = [f"absent-{i}" for i in range(2000)]
+        assert sum(not index.might_contain(k) for k in absent) > 1900  # ~1% false positives
+    finally:
+        index.close()
+
+    reopened = BloomFilter(path, capacity=len(KEYS), fp_rate=0.01)  # "restart"
+    try:
+        assert reopened.ready and _missing(reopened, KEYS) == []
+    finally:
+        reopened.close()
+
+
+def test_keys_added_during_rebuild_survive_the_swap(path: Path) -> None:
+    worker = BloomFilter(path, capacity=len(KEYS))  # the process rebuilding
+    other = BloomFilter(path, capacity=len(KEYS))  # another worker inserting meanwhile
+    late = [f"late-{i}" for i in range(50)]
+    try:
+        assert worker.rebuild(iter(KEYS))
+        stale = other._buf
+
+        def scan() -> Iterator[str]:
+            # The table scan misses rows inserted after it started
+            for i, key in enumerate(KEYS):
+                if i == len(KEYS) // 2:
+                    for k in late:
+                        other.add(k)
+                yield key
+
+        assert worker.rebuild(scan())
+        assert stale[bloom._RETIRED_OFFSET] == 1  # `other` re-attaches on its next call
+        for index in (worker, other):
+            assert _missing(index, KEYS + late) == []
+        assert other._buf is not stale
+    finally:
+        worker.close()
+        other.close()
+
+    reopened = BloomFilter(path)
+    try:
+        assert _missing(reopened, KEYS + late) == []
+    finally:
+        reopened.close()
+
+
+def test_journal_overflow_keeps_the_old_snapshot(path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    index = BloomFilter(path, capacity=len(KEYS))
+    try:
+        assert index.rebuild(iter(KEYS))
+        monkeypatch.setattr(bloom, "_JOURNAL_SLOTS", 2)
+
+        def scan() -> Iterator[str]:
+            for k in ("late-1", "late-2", "late-3"):
+                index.add(k)
+            yield from KEYS
+
+        assert not index.rebuild(scan())
+        assert _missing(index, KEYS + ["late-1", "late-2", "late-3"]) == []
+    finally:
+        index.close()
+
+
+def test_no_false_negatives_in_another_process(path: Path) -> None:
+    index = BloomFilter(path, capacity=len(KEYS))
+    try:
+        assert index.rebuild(iter(KEYS))
+        index.add("added-after-build")
+        code = f"""
+            from src.main.services.cache import BloomFilter
+            keys = [f"key-{{i}}" for i in range({len(KEYS)})] + ["added-after-build"]
+            index = BloomFilter({str(path)!r})
+            print(sum(not index.might_contain(k) for k in keys))
+        """
+        out = subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(code)],
+            cwd=ROOT, capture_output=True, text=True, timeout=30, check=True,
+        ).stdout.strip()
+        assert out == "0"
+    finally:
+        index.close()
+
+
+def test_reinserts_do_not_inflate_key_count(path: Path) -> None:
+    index = BloomFilter(path, capacity=len(KEYS), fp_rate=0.01)
+    try:
+        assert index.rebuild(iter(KEYS))
+        before = index.metrics()
+        for _ in range(3):
+            for key in KEYS[:500]:
+                index.add(key)
+        after = index.metrics()
+        assert after["keys"] == before["keys"] == len(KEYS)
+        assert after["expected_fp_rate"] == before["expected_fp_rate"]
+
+        # Rebuilds size for 1.25 x the keys, not for the re-inserts: the size settles
+        assert index.rebuild(iter(KEYS))
+        settled = index.metrics()["bits"]
+        for _ in range(3):
+            for key in KEYS[:500]:
+                index.add(key)
+            assert index.rebuild(iter(KEYS))
+            assert index.metrics()["bits"] == settled
+
+        index.add("brand-new")
+        assert index.metrics()["keys"] == len(KEYS) + 1
+    finally:
+        index.close()
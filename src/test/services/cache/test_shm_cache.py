@@ -0,0 +1,183 @@
+"""
+SharedMemoryCache: get/set, TTL expiry, CLOCK eviction, cross-process visibility,
+and DB_Interface read-through with a fake MakeConnection injected.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import pytest
+
+from src.main.services.cache import SharedMemoryCache
+from src.main.services.cache import shm_cache
+from src.main.services.database.conn_instance import MakeConnection
+from src.main.services.database.db_interface import DB_Interface
+
+ROOT = Path(__file__).resolve().parents[4]
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    c = SharedMemoryCache(tmp_path / "test.cache", slots=64, slot_size=256, probe=4, default_ttl=60)
+    yield c
+    c.close()
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_get_set_delete(cache: SharedMemoryCache) -> None:
+    assert cache.get("a") is None
+    cache.set("a", {"rows": [1, 2]})
+    cache["b"] = "two"
+    assert cache.get("a") == {"rows": [1, 2]}
+    assert cache["b"] == "two"
+    assert "a" in cache and "missing" not in cache
+    cache.set("a", "replaced")
+    assert cache["a"] == "replaced"
+    assert sorted(cache) == ["a", "b"]
+    assert cache.delete("a") and not cache.delete("a")
+    with pytest.raises(KeyError):
+        cache["a"]
+
+
+def test_oversized_value_is_rejected(cache: SharedMemoryCache) -> None:
+    with pytest.raises(ValueError):
+        cache.set("big", "x" * 1000)
+    assert "big" not in cache
+
+
+def test_ttl_expiry(cache: SharedMemoryCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _Clock(1000.0)
+    monkeypatch.setattr(shm_cache, "time", clock)
+    cache.set("short", 1, ttl=5)
+    cache.set("forever", 2, ttl=0)
+    cache.set("default", 3)  # default_ttl=60
+    clock.now += 4
+    assert cache.get("short") == 1
+    clock.now += 2
+    assert cache.get("short") is None
+    assert cache.get("default") == 3
+    clock.now += 60
+    assert cache.get("default") is None
+    assert cache.get("forever") == 2
+
+
+def test_expired_slot_is_reused_before_evicting(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _Clock(1000.0)
+    monkeypatch.setattr(shm_cache, "time", clock)
+    c = SharedMemoryCache(tmp_path / "full.cache", slots=4, slot_size=128, probe=4)
+    try:
+        c.set("old", 0, ttl=1)
+        for key in ("k1", "k2", "k3"):
+            c.set(key, key, ttl=0)
+        clock.now += 2
+        c.set("new", 1, ttl=0)
+        assert sorted(c) == ["k1", "k2", "k3", "new"]
+    finally:
+        c.close()
+
+
+def test_clock_eviction_gives_recently_read_entries_a_second_chance(tmp_path: Path) -> None:
+    # slots == probe: every key shares one window, so it is full after 4 sets
+    c = SharedMemoryCache(tmp_path / "clock.cache", slots=4, slot_size=128, probe=4, default_ttl=0)
+    try:
+        for key in ("k1", "k2", "k3", "k4"):
+            c.set(key, key)
+        c.set("k5", "k5")  # all ref bits set: one sweep clears them, then one entry goes
+        keys = set(c)  # iterating does not set ref bits
+        assert len(keys) == 4 and "k5" in keys
+        survivors = sorted(keys - {"k5"})
+
+        kept = survivors[0]
+        assert c[kept] == kept  # read -> ref bit set again
+        c.set("k6", "k6")  # evicts an unreferenced entry: neither `kept` nor k5 (set after the sweep)
+        assert {kept, "k5", "k6"} <= set(c) and len(c) == 4
+    finally:
+        c.close()
+
+
+def test_layout_mismatch_raises(tmp_path: Path) -> None:
+    SharedMemoryCache(tmp_path / "layout.cache", slots=16).close()
+    with pytest.raises(ValueError):
+        SharedMemoryCache(tmp_path / "layout.cache", slots=32)
+
+
+def _run_child(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_cross_process_visibility(cache: SharedMemoryCache) -> None:
+    cache.set("from-parent", [1, 2, 3])
+    out = _run_child(
+        f"""
+        from src.main.services.cache import SharedMemoryCache
+        c = SharedMemoryCache({str(cache.path)!r}, slots=64, slot_size=256, probe=4, default_ttl=60)
+        print(c.get("from-parent"))
+        c.set("from-child", {{"pid": "child"}})
+        """
+    )
+    assert out == "[1, 2, 3]"
+    assert cache.get("from-child") == {"pid": "child"}
+
+
+def test_cross_process_delete(cache: SharedMemoryCache) -> None:
+    cache.set("to-delete", 1)
+    _run_child(
+        f"""
+        from src.main.services.cache import SharedMemoryCache
+        SharedMemoryCache({str(cache.path)!r}, slots=64, slot_size=256, probe=4).delete("to-delete")
+        """
+    )
+    assert "to-delete" not in cache
+
+
+class _FakeMakeConnection(MakeConnection):
+    """Counts query() calls and returns canned rows; no database."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        super().__init__(dsn="fake", user="fake", password="fake")
+        self.rows = rows
+        self.queries = 0
+        self.writes = 0
+
+    def query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> list[dict[str, Any]]:
+        self.queries += 1
+        return list(self.rows)
+
+    def non_query(self, sql: Any, params: Optional[Iterable[Any]] = None) -> int:
+        self.writes += 1
+        return 1
+
+
+def test_db_read_through_and_invalidation(cache: SharedMemoryCache) -> None:
+    db = DB_Interface(dsn="fake", user="fake", password="fake", cache=cache, cache_ttl=60)
+    db.conn = _FakeMakeConnection([{"COLUMNNAME": "v"}])
+
+    assert db.finddb1("v") == [{"COLUMNNAME": "v"}]
+    assert db.finddb1("v") == [{"COLUMNNAME": "v"}]
+    assert db.finddb2("v") is True
+    assert db.finddb2("v") is True
+    assert db.conn.queries == 2  # one per lookup kind; repeats are hits
+
+    db.insertdb("v", "2024-01-01 00:00:00")
+    db.finddb1("v")
+    assert db.conn.queries == 3  # insert invalidated the cached rows
@@ -0,0 +1,110 @@
+"""
+Statement registry: DB_Interface only executes registered statements, and the
+startup warm-up prepares each of them on `pool_min` connections.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from src.main.services.database import db_api
+from src.main.services.database.conn_instance import MakeConnection
+from src.main.services.database.statements import STATEMENTS, Statement, StatementRegistry
+
+
+class WarmUpConnection(MakeConnection):
+    """
+    Records pool traffic; `fail_on` names statements whose prepare raises.
+    """
+
+    def __init__(self, fail_on: tuple[str, ...] = (), **kwargs: Any) -> None:
+        super().__init__(dsn="fake", user="fake", password="fake", **kwargs)
+        self.fail_on = fail_on
+        self.acquired: list[object] = []
+        self.released: list[object] = []
+        self.prepared: list[tuple[object, str]] = []
+
+    def _acquire(self, timeout: Any = None) -> object:
+        conn = object()
+        self.acquired.append(conn)
+        return conn
+
+    def _release(self, conn: object) -> None:
+        self.released.append(conn)
+
+    def _prepare(self, conn: object, statement: Statement) -> None:
+        if statement.name in self.fail_on:
+            raise RuntimeError(f"ORA-00942: {statement.name}")
+        self.prepared.append((conn, statement.name))
+
+
+def test_every_db_interface_call_uses_a_registered_statement(table) -> None:
+    table.add("v", datetime(2024, 5, 1, 12, 0, 0))
+    table.add("v", datetime(2024, 5, 1, 12, 0, 1))
+
+    db_api.insertdb("w", "2024-05-01 12:00:00")
+    db_api.finddb1("v")
+    rows, cursor = db_api.finddb1_page("v", limit=1)
+    db_api.finddb1_page("v", limit=1, cursor=cursor)
+    db_api.version_token("v")
+    db_api.finddb2("v")
+    list(db_api.iter_keys())
+
+    # TableConnection rejects anything but a Statement, so no inline SQL got through
+    assert set(table.executed) == {s.name for s in STATEMENTS}
+    for name in table.executed:
+        assert STATEMENTS[name].sql.strip() == STATEMENTS[name].sql
+
+
+def test_registry_rejects_conflicting_names() -> None:
+    registry = StatementRegistry()
+    first = registry.register("q", """
+        SELECT 1
+        FROM DUAL""")
+    assert first.sql == "SELECT 1\nFROM DUAL" and str(first) == first.sql
+    assert registry.register("q", "SELECT 1\nFROM DUAL") == first  # same text: idempotent
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register("q", "SELECT 2 FROM DUAL")
+    with pytest.raises(ValueError, match="kind"):
+        registry.register("r", "SELECT 1 FROM DUAL", kind="ddl")
+    assert "q" in registry and len(registry) == 1
+
+
+def test_warm_up_prepares_every_statement_on_pool_min_connections() -> None:
+    conn = WarmUpConnection(pool_min=3, stmt_cache_size=50)
+    report = conn.warm_up(STATEMENTS)
+
+    assert len(conn.acquired) == 3
+    assert sorted(map(id, conn.released)) == sorted(map(id, conn.acquired))
+    for held in conn.acquired:
+        assert [name for c, name in conn.prepared if c is held] == [s.name for s in STATEMENTS]
+    assert report["connections"] == 3 and report["statements"] == len(STATEMENTS)
+    assert report["failed"] == 0
+
+
+def test_failing_prepare_is_skipped_not_fatal() -> None:
+    conn = WarmUpConnection(fail_on=("finddb2",), pool_min=2, stmt_cache_size=50)
+    report = conn.warm_up(STATEMENTS)
+
+    assert report["failed"] == 2  # once per connection
+    assert len(conn.prepared) == 2 * (len(STATEMENTS) - 1)
+    assert "finddb2" not in {name for _, name in conn.prepared}
+    assert len(conn.released) == 2
+
+
+def test_startup_survives_a_failed_warm_up(table, monkeypatch: pytest.MonkeyPatch) -> None:
+    from fastapi.testclient import TestClient
+
+    from src.main.config import get_settings
+    from src.main.main import create_app
+
+    def broken() -> dict[str, Any]:
+        raise ConnectionError("listener refused the connection")
+
+    monkeypatch.setattr(get_settings().database, "warm_up", True)
+    monkeypatch.setattr(db_api, "warm_up", broken)
+    with TestClient(create_app()) as client:
+        assert client.get("/healthy").status_code == 200
@@ -0,0 +1,143 @@
+"""
+CpuPool / @cpu_bound: inline fallback, offload of functions and methods,
+payload size limits, and timeout accounting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import time
+from concurrent.futures import Future
+from typing import Iterator
+
+import pytest
+
+from src.main.services.executor.cpu_pool import CpuPool, cpu_bound
+
+# The package re-exports the shared `cpu_pool` instance under the module's name
+cpu_pool_module = importlib.import_module("src.main.services.executor.cpu_pool")
+
+
+# Module level so spawned workers can import them
+@cpu_bound
+def square_and_pid(x: int) -> tuple[int, int]:
+    return x * x, os.getpid()
+
+
+@cpu_bound(timeout=0.05)
+def nap(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+class Scaler:
+    def __init__(self, factor: int) -> None:
+        self.factor = factor
+
+    @cpu_bound
+    def scale(self, x: int) -> tuple[int, int]:
+        return x * self.factor, os.getpid()
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> CpuPool:
+    """
+    A fresh, not-started pool behind @cpu_bound.
+    """
+    p = CpuPool(max_workers=1, prewarm=False, timeout_seconds=5.0)
+    monkeypatch.setattr(cpu_pool_module, "cpu_pool", p)
+    return p
+
+
+@pytest.fixture
+def started(pool: CpuPool) -> Iterator[CpuPool]:
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def _pending_future(pool: CpuPool, monkeypatch: pytest.MonkeyPatch) -> Future:
+    """
+    Make the pool look started and hand out one future that never completes.
+    """
+    fut: Future = Future()
+    monkeypatch.setattr(pool, "_executor", object())
+    monkeypatch.setattr(pool, "submit_future", lambda func, *a, **kw: fut)
+    return fut
+
+
+def test_runs_inline_when_pool_not_started(pool: CpuPool) -> None:
+    assert square_and_pid(3) == (9, os.getpid())
+    assert Scaler(2).scale(5) == (10, os.getpid())
+    assert asyncio.run(square_and_pid.aio(4))[0] == 16
+    assert asyncio.run(Scaler(3).scale.aio(2))[0] == 6
+    assert pool.metrics()["inline"] == 4
+    assert pool.metrics()["submitted"] == 0
+
+
+def test_decorator_keeps_function_identity() -> None:
+    assert square_and_pid.__name__ == "square_and_pid"
+    assert square_and_pid.__wrapped__(2)[0] == 4
+    assert Scaler.scale.__qualname__ == "Scaler.scale"
+    assert Scaler(1).scale.__self__.factor == 1
+
+
+def test_offloads_functions_and_methods_to_workers(started: CpuPool) -> None:
+    value, pid = square_and_pid(7)
+    assert value == 49 and pid != os.getpid()
+
+    value, pid = Scaler(4).scale(5)
+    assert value == 20 and pid != os.getpid()
+
+    value, pid = asyncio.run(Scaler(2).scale.aio(8))
+    assert value == 16 and pid != os.getpid()
+
+    m = started.metrics()
+    assert m["submitted"] == m["completed"] == 3
+    assert m["queue_depth"] == 0 and m["inline"] == 0
+
+
+def test_oversized_payload_is_rejected_before_queueing(started: CpuPool) -> None:
+    started.max_payload_bytes = 256
+    with pytest.raises(ValueError, match="pickled arguments"):
+        started.call(len, b"x" * 1024)
+    assert started.metrics()["submitted"] == 0
+    assert started.call(len, b"x" * 16) == 16
+
+
+def test_timeout_cancels_and_is_counted(pool: CpuPool, monkeypatch: pytest.MonkeyPatch) -> None:
+    fut = _pending_future(pool, monkeypatch)
+    with pytest.raises(TimeoutError, match="timed out in CPU pool"):
+        pool.call(len, b"", timeout=0.01)
+    assert fut.cancelled()
+    assert pool.metrics()["timeouts"] == 1
+
+
+def test_async_timeout_cancels_the_pool_future(pool: CpuPool, monkeypatch: pytest.MonkeyPatch) -> None:
+    fut = _pending_future(pool, monkeypatch)
+    with pytest.raises(TimeoutError, match="timed out in CPU pool"):
+        asyncio.run(pool.call_async(len, b"", timeout=0.01))
+    assert fut.cancelled()
+    assert pool.metrics()["timeouts"] == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_timeout_error_raised_by_func_is_not_a_pool_timeout(
+    pool: CpuPool, monkeypatch: pytest.MonkeyPatch, use_async: bool
+) -> None:
+    fut = _pending_future(pool, monkeypatch)
+    fut.set_exception(TimeoutError("upstream service timed out"))
+    with pytest.raises(TimeoutError, match="upstream service"):
+        if use_async:
+            asyncio.run(pool.call_async(len, b""))
+        else:
+            pool.call(len, b"")
+    assert pool.metrics()["timeouts"] == 0
+
+
+def test_decorator_timeout_applies_to_real_workers(started: CpuPool) -> None:
+    with pytest.raises(TimeoutError, match="nap timed out"):
+        nap(1.0)
+    assert started.metrics()["timeouts"] == 1
@@ -0,0 +1,95 @@
+"""
+conditional_get: version-token ETags on GET /router1/geturl and the body-hash fallback.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.main.schemas import SuccessResponseModel
+from src.main.services.database import db_api
+from src.main.utils.conditional import conditional_get, etag_matches
+from src.main.utils.resp_util import handle_resp
+
+
+def test_etag_then_304_skips_the_page_query(client, table) -> None:
+    table.add("a", datetime(2024, 1, 1))
+    first = client.get("/router1/geturl", params={"value": "a"})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    table.executed.clear()
+    again = client.get("/router1/geturl", params={"value": "a"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert table.executed == ["finddb1_version"]  # no page query, no serialization
+
+
+def test_etag_depends_on_query_string(client, table) -> None:
+    table.add("a", datetime(2024, 1, 1))
+    e1 = client.get("/router1/geturl", params={"value": "a"}).headers["etag"]
+    e2 = client.get("/router1/geturl", params={"value": "a", "limit": 5}).headers["etag"]
+    assert e1 != e2
+
+
+def test_token_changes_after_insertdb(client, table) -> None:
+    table.add("a", datetime(2024, 1, 1))
+    etag = client.get("/router1/geturl", params={"value": "a"}).headers["etag"]
+    token = db_api.version_token("a")
+
+    db_api.insertdb("a", "2024-01-02 00:00:00")
+    assert db_api.version_token("a") != token
+    resp = client.get("/router1/geturl", params={"value": "a"}, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert len(resp.json()["data"]) == 2
+
+
+def test_token_sees_writes_made_outside_the_interface(table) -> None:
+    token = db_api.version_token("a")
+    table.add("a", datetime(2024, 1, 1))  # another system wrote the row
+    assert db_api.version_token("a") != token
+    assert db_api.version_token("b") == db_api.version_token("c")  # both empty
+
+
+def _body_hash_app(version: Optional[object]) -> tuple[TestClient, dict]:
+    state = {"msg": "one", "calls": 0}
+    app = FastAPI()
+
+    @app.get("/x")
+    @conditional_get(cache_control="no-cache", version=version)
+    def endpoint(value: str = "v"):
+        state["calls"] += 1
+        return handle_resp(SuccessResponseModel(msg=state["msg"]))
+
+    return TestClient(app), state
+
+
+def test_body_hash_fallback_without_a_token() -> None:
+    for version in (None, lambda **_: None):  # no version callable / token unavailable
+        c, state = _body_hash_app(version)
+        first = c.get("/x")
+        etag = first.headers["etag"]
+        assert c.get("/x").headers["etag"] == etag  # same body, same ETag
+
+        resp = c.get("/x", headers={"If-None-Match": f'W/{etag}'})
+        assert resp.status_code == 304 and resp.content == b""
+        assert state["calls"] == 3  # the handler still runs; only the transfer is saved
+
+        state["msg"] = "two"
+        changed = c.get("/x", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"b"', '"a"')
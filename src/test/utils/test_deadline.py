@@ -0,0 +1,157 @@
+"""
+Request deadlines: 504 from DeadlineMiddleware, header/route/default precedence,
+budget() / check_deadline() for lower layers, and teardown on client disconnect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextvars import copy_context
+from typing import Any, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.main.schemas import InternalServerErrorModel, SuccessResponseModel
+from src.main.services.executor.cpu_pool import CpuPool
+from src.main.utils.deadline import (
+    DeadlineExceededError,
+    DeadlineMiddleware,
+    budget,
+    check_deadline,
+    current_deadline,
+    with_deadline,
+)
+from src.main.utils.decorator import async_handle_except, handle_except
+from src.main.utils.resp_util import handle_resp
+
+
+def _in_deadline(seconds: float, fn: Any) -> Any:
+    """
+    Run fn under a fresh @with_deadline budget, isolated from the test's context.
+    """
+    return copy_context().run(with_deadline(seconds)(fn))
+
+
+@pytest.fixture
+def slow_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware, header="X-Request-Timeout", default_seconds=0.0)
+
+    @app.get("/sync")
+    @handle_except
+    @with_deadline(0.1)
+    def sync_route(sleep: float = 0.5):
+        time.sleep(sleep)
+        check_deadline("after sleep")  # what DB calls do before starting work
+        return handle_resp(SuccessResponseModel())
+
+    @app.get("/async")
+    @async_handle_except
+    @with_deadline(0.1)
+    async def async_route(sleep: float = 0.5):
+        await asyncio.sleep(sleep)
+        return handle_resp(SuccessResponseModel())
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_route_deadline_exceeded_is_504_envelope(slow_client: TestClient, path: str) -> None:
+    started = time.monotonic()
+    resp = slow_client.get(path)
+    assert resp.status_code == 504
+    assert time.monotonic() - started < 0.45  # answered at the deadline, not when the route finished
+    body = resp.json()
+    assert set(body) == set(InternalServerErrorModel.model_fields)
+    assert body["status_code"] == "2" and "deadline exceeded" in body["msg"]
+
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_route_within_deadline_is_200(slow_client: TestClient, path: str) -> None:
+    assert slow_client.get(path, params={"sleep": 0.0}).status_code == 200
+
+
+def test_client_header_beats_route_default(slow_client: TestClient) -> None:
+    resp = slow_client.get("/sync", params={"sleep": 0.2}, headers={"X-Request-Timeout": "5"})
+    assert resp.status_code == 200
+    resp = slow_client.get("/sync", params={"sleep": 0.0}, headers={"X-Request-Timeout": "garbage"})
+    assert resp.status_code == 200
+
+
+def test_check_deadline_raises_once_budget_is_spent() -> None:
+    def work() -> None:
+        check_deadline("step 1")
+        time.sleep(0.06)
+        check_deadline("step 2")
+
+    with pytest.raises(DeadlineExceededError, match="before step 2"):
+        _in_deadline(0.05, work)
+    # Outside a request there is no deadline at all
+    check_deadline("anything")
+    assert budget(3.0) == 3.0 and budget() is None
+
+
+def test_budget_is_capped_by_remaining_time() -> None:
+    assert _in_deadline(0.5, lambda: budget(10.0)) <= 0.5
+    assert _in_deadline(10.0, lambda: budget(0.25)) == 0.25
+    left: Optional[float] = _in_deadline(10.0, lambda: budget())
+    assert left is not None and 9.0 < left <= 10.0
+
+
+def test_cpu_pool_timeout_honours_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = CpuPool(max_workers=1, prewarm=False, timeout_seconds=10.0)
+    assert pool._timeout(None) == 10.0
+    assert _in_deadline(0.2, lambda: pool._timeout(None)) <= 0.2
+    assert _in_deadline(5.0, lambda: pool._timeout(0.05)) == 0.05
+
+    # A spent budget never reaches the pool
+    monkeypatch.setattr(pool, "_executor", object())
+    submitted: list[Any] = []
+    monkeypatch.setattr(pool, "submit_future", lambda *a, **kw: submitted.append(a))
+
+    def late_call() -> Any:
+        time.sleep(0.06)
+        return pool.call(len, b"")
+
+    with pytest.raises(DeadlineExceededError):
+        _in_deadline(0.05, late_call)
+    assert submitted == []
+
+
+def test_client_disconnect_cancels_the_app_and_tears_down() -> None:
+    seen: dict[str, Any] = {}
+
+    async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        seen["deadline"] = current_deadline()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            seen["cancelled"] = True
+            raise
+
+    async def receive() -> dict[str, Any]:
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    sent: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    async def run() -> None:
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+        await asyncio.wait_for(DeadlineMiddleware(app)(scope, receive, send), timeout=2.0)
+        # Nothing the middleware started is left running
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert not [t for t in others if not t.done()]
+
+    asyncio.run(run())
+
+    dl = seen["deadline"]
+    assert seen.get("cancelled") is True
+    assert dl.cancelled == "client disconnected" and dl.on_change is None
+    assert sent == []
+    assert current_deadline() is None
@@ -0,0 +1,81 @@
+"""
+Content negotiation: Accept parsing, msgpack request/response round trip, 415/400
+on msgpack bodies, and Vary: Accept.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+msgpack = pytest.importorskip("msgpack")  # optional dependency
+
+from src.main.utils import negotiation  # noqa: E402
+from src.main.utils.negotiation import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, negotiate  # noqa: E402
+
+PAYLOAD = json.loads((Path(__file__).resolve().parents[3] / "payload.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("application/*", JSON_MEDIA_TYPE),
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack, */*", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack, application/*;q=0.8", MSGPACK_MEDIA_TYPE),
+        ("application/json, application/msgpack", JSON_MEDIA_TYPE),
+        ("application/msgpack;q=0.5, application/json", JSON_MEDIA_TYPE),
+        ("application/json;q=0.5, application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0, */*", JSON_MEDIA_TYPE),
+        ("application/*, application/msgpack;q=0.9", JSON_MEDIA_TYPE),
+        ("text/html", JSON_MEDIA_TYPE),
+    ],
+)
+def test_negotiate(accept, expected) -> None:
+    assert negotiate(accept) == expected
+
+
+def test_msgpack_request_and_response_round_trip(client) -> None:
+    resp = client.post(
+        "/router1/posturl",
+        content=msgpack.packb(PAYLOAD),
+        headers={"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": f"{MSGPACK_MEDIA_TYPE}, */*"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    body = msgpack.unpackb(resp.content)
+    assert body["status_code"] == "0" and body["data"] == [{"message": "success"}]
+    assert "Accept" in resp.headers["vary"]
+
+
+def test_json_stays_default_and_varies_on_accept(client) -> None:
+    resp = client.post("/router1/posturl", json=PAYLOAD)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == JSON_MEDIA_TYPE
+    assert resp.json()["status_code"] == "0"
+    assert "Accept" in resp.headers["vary"]
+
+
+def test_msgpack_body_is_validated_like_json(client) -> None:
+    bad = {**PAYLOAD, "attribute2": "not-an-object"}
+    resp = client.post("/router1/posturl", content=msgpack.packb(bad), headers={"Content-Type": MSGPACK_MEDIA_TYPE})
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"][:2] == ["body", "attribute2"]
+
+
+def test_malformed_msgpack_body_is_400(client) -> None:
+    resp = client.post("/router1/posturl", content=b"\xc1\xff\x00", headers={"Content-Type": MSGPACK_MEDIA_TYPE})
+    assert resp.status_code == 400
+
+
+def test_msgpack_body_without_msgpack_installed_is_415(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(negotiation, "MSGPACK_AVAILABLE", False)
+    resp = client.post("/router1/posturl", content=msgpack.packb(PAYLOAD), headers={"Content-Type": MSGPACK_MEDIA_TYPE})
+    assert resp.status_code == 415
+    # Responses fall back to JSON too
+    assert negotiate(MSGPACK_MEDIA_TYPE) == JSON_MEDIA_TYPE
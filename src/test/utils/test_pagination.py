@@ -0,0 +1,142 @@
+"""
+Keyset pagination over GET /router1/geturl, and the signed cursor tokens behind it.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from src.main.utils import pagination
+from src.main.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+T0 = datetime(2024, 5, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def signing_key() -> Iterator[None]:
+    pagination._signing_key.cache_clear()
+    yield
+    pagination._signing_key.cache_clear()
+
+
+def _pages(client: Any, value: str, limit: int) -> list[dict[str, Any]]:
+    pages, cursor = [], None
+    while True:
+        params = {"value": value, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        resp = client.get("/router1/geturl", params=params)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        pages.append(body)
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 50, "pagination did not terminate"
+
+
+def test_pages_cover_every_row_once_with_equal_sort_keys(client, table) -> None:
+    # Runs of identical column2name values straddle page boundaries; id breaks the ties
+    for i in range(11):
+        table.add("v", T0 + timedelta(minutes=i // 4))
+    table.add("other", T0)
+
+    pages = _pages(client, "v", limit=3)
+
+    ids = [row["ID"] for page in pages for row in page["data"]]
+    expected = [r["ID"] for r in table._matching("v")]
+    assert ids == expected and len(set(ids)) == 11
+    assert [len(p["data"]) for p in pages] == [3, 3, 3, 2]
+    assert pages[-1]["next_cursor"] is None
+    assert "finddb1_page_seek" in table.executed
+
+
+def test_exact_multiple_of_limit_ends_with_null_cursor(client, table) -> None:
+    for i in range(4):
+        table.add("v", T0 + timedelta(seconds=i))
+    pages = _pages(client, "v", limit=2)
+    assert [len(p["data"]) for p in pages] == [2, 2]
+    assert pages[-1]["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "mangle",
+    [
+        lambda c: c.split(".")[0] + "." + "A" * 22,  # forged signature
+        lambda c: "e30." + c.split(".")[1],  # swapped body ({})
+        lambda c: c.replace(".", ""),  # no signature part
+        lambda c: "not-a-cursor",
+    ],
+    ids=["signature", "body", "structure", "garbage"],
+)
+def test_tampered_cursor_is_400(client, table, mangle) -> None:
+    for i in range(3):
+        table.add("v", T0 + timedelta(seconds=i))
+    cursor = client.get("/router1/geturl", params={"value": "v", "limit": 1}).json()["next_cursor"]
+
+    resp = client.get("/router1/geturl", params={"value": "v", "limit": 1, "cursor": mangle(cursor)})
+    assert resp.status_code == 400
+    body = resp.json()
+    assert body["status_code"] == "1" and "cursor" in body["msg"]
+
+
+def test_cursor_from_another_query_is_400(client, table) -> None:
+    for value in ("v", "w"):
+        for i in range(3):
+            table.add(value, T0 + timedelta(seconds=i))
+    cursor = client.get("/router1/geturl", params={"value": "v", "limit": 1}).json()["next_cursor"]
+
+    resp = client.get("/router1/geturl", params={"value": "w", "limit": 1, "cursor": cursor})
+    assert resp.status_code == 400
+    assert resp.json()["msg"] == "cursor does not belong to this query"
+
+
+def test_cursor_round_trips_dates_and_datetimes() -> None:
+    keys = {"COLUMN2NAME": datetime(2024, 5, 1, 12, 30, 15, 250), "DAY": date(2024, 5, 1), "ID": 42}
+    decoded = decode_cursor(encode_cursor(keys, scope="s"), scope="s")
+    assert decoded == keys
+    assert type(decoded["COLUMN2NAME"]) is datetime and type(decoded["DAY"]) is date
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(keys, scope="s"), scope="t")
+
+
+def test_secret_is_required_outside_development(monkeypatch: pytest.MonkeyPatch, signing_key: None) -> None:
+    from src.main.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "secret_variable", None)
+    monkeypatch.setattr(settings, "app_env", "staging")
+    with pytest.raises(RuntimeError, match="SECRET_VARIABLE"):
+        encode_cursor({"ID": 1}, scope="s")
+
+    pagination._signing_key.cache_clear()
+    monkeypatch.setattr(settings, "secret_variable", "s3cret")
+    assert pagination._signing_key() == b"s3cret"
+
+
+def test_host_key_is_shared_and_private(tmp_path: Path) -> None:
+    key = pagination._host_key(str(tmp_path))
+    assert len(key) == 32 and pagination._host_key(str(tmp_path)) == key
+    path = tmp_path / pagination._HOST_KEY_NAME
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert not [p for p in tmp_path.iterdir() if p != path]  # temp files cleaned up
+
+
+def test_host_key_readable_by_others_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / pagination._HOST_KEY_NAME
+    path.write_bytes(os.urandom(32))
+    path.chmod(0o644)
+    with pytest.raises(RuntimeError, match="private cursor key"):
+        pagination._host_key(str(tmp_path))
+
+
+def test_host_key_symlink_is_rejected(tmp_path: Path) -> None:
+    target = tmp_path / "elsewhere"
+    target.write_bytes(os.urandom(32))
+    target.chmod(0o600)
+    (tmp_path / pagination._HOST_KEY_NAME).symlink_to(target)
+    with pytest.raises(OSError):
+        pagination._host_key(str(tmp_path))
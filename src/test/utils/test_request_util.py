@@ -0,0 +1,122 @@
+"""
+Request limits: 413 from BodySizeLimitMiddleware (declared and streamed bodies)
+and the [RequestLimits] collection limits on router1_basemodel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from src.main.config import get_settings
+from src.main.schemas import InternalServerErrorModel
+from src.main.utils.request_util import BodySizeLimitMiddleware
+
+PAYLOAD = json.loads((Path(__file__).resolve().parents[3] / "payload.json").read_text(encoding="utf-8"))
+LIMIT = get_settings().request_limits.max_body_bytes
+
+
+def _oversized() -> bytes:
+    body = {**PAYLOAD, "attribute1": "x" * LIMIT}
+    return json.dumps(body).encode("utf-8")
+
+
+def _chunks(body: bytes, size: int = 64 * 1024) -> Iterator[bytes]:
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def _assert_413_envelope(resp: Any) -> None:
+    assert resp.status_code == 413
+    assert resp.headers["connection"] == "close"
+    body = resp.json()
+    # Same envelope as every other error, validated against the documented model
+    assert set(body) == set(InternalServerErrorModel.model_fields)
+    model = InternalServerErrorModel.model_validate(body)
+    assert model.status_code == "1" and str(LIMIT) in model.msg
+
+
+def test_declared_content_length_over_limit_is_413(client) -> None:
+    resp = client.post("/router1/posturl", content=_oversized(), headers={"Content-Type": "application/json"})
+    _assert_413_envelope(resp)
+
+
+def test_streamed_body_over_limit_is_413(client, table) -> None:
+    resp = client.post("/router1/posturl", content=_chunks(_oversized()), headers={"Content-Type": "application/json"})
+    assert "content-length" not in resp.request.headers  # chunked: only the byte count can catch it
+    _assert_413_envelope(resp)
+    assert "insertdb" not in table.executed
+
+
+def test_middleware_stops_reading_once_chunks_exceed_limit() -> None:
+    from starlette.requests import Request
+
+    reached_app: list[bool] = []
+
+    async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        await Request(scope, receive).body()
+        reached_app.append(True)
+
+    chunks = [b"x" * 40] * 10
+    pulled: list[int] = []
+
+    async def receive() -> dict[str, Any]:
+        pulled.append(1)
+        return {"type": "http.request", "body": chunks[len(pulled) - 1], "more_body": len(pulled) < len(chunks)}
+
+    sent: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": [], "query_string": b""}
+    asyncio.run(BodySizeLimitMiddleware(app, max_body_bytes=100)(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    assert len(pulled) == 3 and not reached_app  # 120 bytes > 100: stopped at the third chunk
+
+
+def test_body_within_limit_passes(client) -> None:
+    resp = client.post("/router1/posturl", content=_chunks(json.dumps(PAYLOAD).encode("utf-8")),
+                       headers={"Content-Type": "application/json"})
+    assert resp.status_code == 200
+
+
+def test_413_carries_cors_headers(client) -> None:
+    resp = client.post(
+        "/router1/posturl",
+        content=_oversized(),
+        headers={"Content-Type": "application/json", "Origin": "https://example.com"},
+    )
+    assert resp.status_code == 413
+    assert resp.headers["access-control-allow-origin"] in ("*", "https://example.com")
+
+
+@pytest.mark.parametrize(
+    "path, setting",
+    [
+        (("attribute2", "attribute5"), "attribute5_max_items"),
+        (("attribute3", "attribute2"), "attribute2_max_items"),
+    ],
+)
+def test_list_fields_enforce_request_limits(client, path: tuple[str, str], setting: str) -> None:
+    max_items = getattr(get_settings().request_limits, setting)
+    outer, inner = path
+
+    at_limit = {**PAYLOAD, outer: {**PAYLOAD[outer], inner: ["i"] * max_items}}
+    assert client.post("/router1/posturl", json=at_limit).status_code == 200
+
+    over = {**PAYLOAD, outer: {**PAYLOAD[outer], inner: ["i"] * (max_items + 1)}}
+    resp = client.post("/router1/posturl", json=over)
+    assert resp.status_code == 422
+    error = resp.json()["detail"][0]
+    assert error["loc"] == ["body", outer, inner] and error["type"] == "too_long"
+
+
+def test_413_is_documented(client) -> None:
+    responses = client.get("/openapi.json").json()["paths"]["/router1/posturl"]["post"]["responses"]
+    assert "413" in responses
@@ -0,0 +1,186 @@
+"""
+Tracing: head/tail sampling, slowest-N retention, span nesting, and the
+background JSON-lines exporter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.main.utils import tracing
+from src.main.utils.tracing import JsonLinesExporter, Trace, Tracer
+
+
+class _ListExporter:
+    def __init__(self) -> None:
+        self.traces: list[Trace] = []
+
+    def export(self, trace: Trace) -> None:
+        self.traces.append(trace)
+
+
+def _finished(tracer: Tracer, duration_ms: float, **attrs: Any) -> Trace:
+    trace = tracer.start(**attrs)
+    trace.start_ns = time.perf_counter_ns() - int(duration_ms * 1e6)
+    tracer.finish(trace)
+    return trace
+
+
+@pytest.mark.parametrize("draw, expected", [(0.0, True), (0.5, False), (0.99, False)])
+def test_head_sampling_decides_up_front(monkeypatch: pytest.MonkeyPatch, draw: float, expected: bool) -> None:
+    monkeypatch.setattr(tracing.random, "random", lambda: draw)
+    assert Tracer(mode="head", sample_rate=0.5).should_record() is expected
+
+
+def test_sample_rate_bounds_and_off_mode() -> None:
+    assert Tracer(mode="head", sample_rate=1.0).should_record()
+    assert not Tracer(mode="head", sample_rate=0.0).should_record()
+    assert not Tracer(mode="off", sample_rate=1.0).should_record()
+    assert Tracer(mode="tail").should_record()
+    with pytest.raises(ValueError):
+        Tracer(mode="sometimes")
+
+
+def test_tail_mode_exports_only_slow_or_failed_traces() -> None:
+    exporter = _ListExporter()
+    tracer = Tracer(mode="tail", tail_threshold_ms=100.0, exporter=exporter)  # type: ignore[arg-type]
+
+    fast = _finished(tracer, 1.0, status=200)
+    slow = _finished(tracer, 250.0, status=200)
+    failed = _finished(tracer, 1.0, status=503)
+    with tracing.activate_trace(tracer.start(status=200)) as errored:
+        with pytest.raises(RuntimeError), tracing.span("db"):
+            raise RuntimeError("boom")
+    tracer.finish(errored)
+
+    assert exporter.traces == [slow, failed, errored]
+    assert fast not in exporter.traces
+
+
+def test_head_mode_exports_every_sampled_trace() -> None:
+    exporter = _ListExporter()
+    tracer = Tracer(mode="head", sample_rate=1.0, tail_threshold_ms=100.0, exporter=exporter)  # type: ignore[arg-type]
+    _finished(tracer, 1.0)
+    assert len(exporter.traces) == 1
+
+
+def test_slowest_keeps_the_n_slowest_in_order() -> None:
+    tracer = Tracer(mode="tail", slowest_size=3)
+    for ms in (5, 50, 1, 30, 20, 40):
+        _finished(tracer, ms, label=ms)
+
+    kept = tracer.slowest()
+    assert [t["label"] for t in kept] == [50, 40, 30]
+    assert kept[0]["duration_ms"] >= kept[1]["duration_ms"] >= kept[2]["duration_ms"]
+
+
+def test_spans_are_noops_without_an_active_trace() -> None:
+    calls = []
+
+    @tracing.traced()
+    def work() -> int:
+        calls.append(1)
+        return 7
+
+    assert tracing.current_trace() is None
+    assert work() == 7 and calls == [1]
+    with tracing.span("anything") as s:
+        s.set("ignored", True)
+    assert tracing.handler_span("h") is tracing.span("x")
+
+
+def test_traced_and_handler_span_nest_under_the_current_span() -> None:
+    @tracing.traced("service")
+    def service() -> None:
+        with tracing.span("db.query", rows=3):
+            pass
+
+    @tracing.traced()
+    async def coro() -> int:
+        return 1
+
+    trace = Trace("t-1", {})
+    with tracing.activate_trace(trace):
+        with tracing.span("request") as root:
+            with tracing.handler_span("get_data"):
+                service()
+            with tracing.handler_span("again"):
+                pass
+        assert asyncio.run(coro()) == 1
+    assert tracing.current_trace() is None
+
+    by_name = {s.name: s for s in trace.spans}
+    assert by_name["pre_handler"].parent_id == root.span_id
+    assert by_name["pre_handler"].start_ns == root.start_ns
+    assert by_name["handler:get_data"].parent_id == root.span_id
+    assert by_name["service"].parent_id == by_name["handler:get_data"].span_id
+    assert by_name["db.query"].parent_id == by_name["service"].span_id
+    assert by_name["db.query"].attrs == {"rows": 3}
+    # Only the first handler span records pre_handler
+    assert [s.name for s in trace.spans].count("pre_handler") == 1
+    assert "test_traced_and_handler_span_nest_under_the_current_span.<locals>.coro" in by_name
+
+    names = [s["name"] for s in trace.to_dict()["spans"]]
+    assert names.index("pre_handler") < names.index("handler:get_data") < names.index("service")
+
+
+def test_set_trace_id_adopts_inbound_id() -> None:
+    tracing.set_trace_id("ignored")  # no active trace: no-op
+    with tracing.activate_trace(Trace("generated", {})) as trace:
+        tracing.set_trace_id("inbound-123")
+    assert trace.trace_id == "inbound-123"
+
+
+class _Unserializable:
+    def to_dict(self) -> dict[str, Any]:
+        raise TypeError("cannot serialize")
+
+
+def test_exporter_survives_bad_traces_and_writes_the_rest(tmp_path: Path) -> None:
+    path = tmp_path / "traces" / "out.jsonl"
+    exporter = JsonLinesExporter(path)
+    exporter.export(_Unserializable())  # type: ignore[arg-type]
+    good = Trace("good", {"status": 200})
+    good.end_ns = good.start_ns
+    exporter.export(good)
+    exporter.close(timeout=5.0)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["trace_id"] for line in lines] == ["good"]
+    assert exporter.dropped == 1
+
+
+def test_exporter_counts_write_failures_and_keeps_running(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    exporter = JsonLinesExporter(blocker / "out.jsonl")  # parent is a file: every write fails
+    for i in range(3):
+        exporter.export(Trace(str(i), {}))
+    exporter.close(timeout=5.0)
+    assert exporter.dropped == 3
+
+
+def test_exporter_drops_when_full_and_close_does_not_hang(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    exporter = JsonLinesExporter(tmp_path / "out.jsonl", max_queue=1)
+    release = threading.Event()
+    stuck = threading.Thread(target=release.wait, daemon=True)  # a writer that never drains
+    monkeypatch.setattr(exporter, "_start", lambda: None)
+    exporter._thread = stuck
+    stuck.start()
+    try:
+        exporter.export(Trace("a", {}))
+        exporter.export(Trace("b", {}))
+        assert exporter.dropped == 1
+
+        started = time.monotonic()
+        exporter.close(timeout=0.1)
+        assert time.monotonic() - started < 1.0
+    finally:
+        release.set()